@@ -4,6 +4,7 @@ Handles fetching from RSS, upserting to Supabase, and querying.
 """
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
 import sys
 
@@ -28,8 +29,8 @@ except ImportError:
 
 import feedparser
 from supabase_client import get_supabase_client
-from nlp_utils import generate_eli5_summary_nl
-from categorization_engine import categorize_article
+from nlp_utils import generate_eli5_summary_nl_with_llm, get_summary_sentences
+from categorization_engine import categorize_article, _categorize_with_keywords
 
 
 def generate_stable_id(link: str, published_at: Optional[datetime] = None) -> str:
@@ -44,14 +45,11 @@ def generate_stable_id(link: str, published_at: Optional[datetime] = None) -> st
     return hashlib.md5(stable_string.encode()).hexdigest()
 
 
-def parse_feed_entry(entry: Dict[str, Any], use_llm_categorization: bool = False) -> Dict[str, Any]:
-    """Parse a feedparser entry into article data structure."""
-    # Extract published date
+def parse_entry_published_at(entry: Dict[str, Any]) -> Optional[datetime]:
+    """Extract the published date (RSS pubDate) from a feedparser entry."""
     published_at = None
     if hasattr(entry, 'published_parsed') and entry.published_parsed:
         try:
-            from datetime import datetime
-            import time
             published_at = datetime(*entry.published_parsed[:6])
         except Exception:
             pass
@@ -63,6 +61,19 @@ def parse_feed_entry(entry: Dict[str, Any], use_llm_categorization: bool = False
         except Exception:
             pass
     
+    return published_at
+
+
+def get_entry_stable_id(entry: Dict[str, Any]) -> str:
+    """Get the stable ID for a feedparser entry without parsing the full entry."""
+    return generate_stable_id(entry.get('link', ''), parse_entry_published_at(entry))
+
+
+def parse_feed_entry(entry: Dict[str, Any], use_llm_categorization: bool = False) -> Dict[str, Any]:
+    """Parse a feedparser entry into article data structure."""
+    # Extract published date
+    published_at = parse_entry_published_at(entry)
+    
     # Extract image URL
     image_url = None
     if hasattr(entry, 'media_content') and entry.media_content:
@@ -113,13 +124,11 @@ def parse_feed_entry(entry: Dict[str, Any], use_llm_categorization: bool = False
                 categorization_llm = 'Keywords'
         except Exception as e:
             print(f"LLM categorization failed, using keywords: {e}")
-            from categorization_engine import _categorize_with_keywords
             categories = _categorize_with_keywords(title, description, content or '')[:3]  # Limit to 3
             categorization_llm = 'Keywords'
     else:
         # Use fast keyword matching (non-blocking)
         try:
-            from categorization_engine import _categorize_with_keywords
             categories = _categorize_with_keywords(title, description, content or '')[:3]  # Limit to 3
             categorization_llm = 'Keywords'
         except Exception:
@@ -135,6 +144,7 @@ def parse_feed_entry(entry: Dict[str, Any], use_llm_categorization: bool = False
         'source': 'NOS',
         'published_at': published_at.isoformat() if published_at else None,
         'full_content': content,
+        'summary_plain': get_summary_sentences(content, num_sentences=3) if content else None,  # Precomputed card summary
         'image_url': image_url[:1000] if image_url else None,
         'category': category,  # Legacy single category
         'categories': categories,  # New: multiple categories
@@ -156,7 +166,9 @@ def fetch_and_upsert_articles(feed_url: str, max_items: Optional[int] = None, us
                                 If False, use fast keyword matching (default).
     
     Returns:
-        Dict with counts of fetched, inserted, updated, skipped
+        Dict with counts of fetched, inserted, skipped and errors.
+        Articles that are already stored are skipped (not re-upserted);
+        entries that fail to parse or store are counted as errors.
     """
     storage = get_supabase_client()  # Returns Supabase or LocalStorage
     
@@ -170,8 +182,8 @@ def fetch_and_upsert_articles(feed_url: str, max_items: Optional[int] = None, us
                 'error': f"Feed parsing error: {feed.bozo_exception}",
                 'fetched': 0,
                 'inserted': 0,
-                'updated': 0,
-                'skipped': 0
+                'skipped': 0,
+                'errors': 0
             }
         
         entries = feed.entries
@@ -180,66 +192,45 @@ def fetch_and_upsert_articles(feed_url: str, max_items: Optional[int] = None, us
         
         fetched_count = len(entries)
         inserted_count = 0
-        updated_count = 0
         skipped_count = 0
+        error_count = 0
         
+        # Only process entries that are not stored yet (keyed on link + pubDate).
+        # Existing articles are looked up in a single round-trip so unchanged
+        # items are never re-parsed or re-categorized.
+        entry_ids = []
         for entry in entries:
+            try:
+                entry_ids.append(get_entry_stable_id(entry))
+            except Exception:
+                entry_ids.append(None)
+        
+        existing_ids = storage.get_existing_stable_ids([sid for sid in entry_ids if sid])
+        
+        for entry, stable_id in zip(entries, entry_ids):
+            if stable_id and stable_id in existing_ids:
+                skipped_count += 1
+                continue
+            
             try:
                 article_data = parse_feed_entry(entry, use_llm_categorization=use_llm_categorization)
                 
-                # Check if article already exists (works for both Supabase and LocalStorage)
-                from local_storage import LocalStorage
-                from supabase_client import SupabaseClient
-                
-                if isinstance(storage, LocalStorage):
-                    # Local storage: check if exists
-                    existing = storage.get_article_by_id(article_data['stable_id'])
-                    if existing:
-                        # Preserve ELI5 if exists
-                        if existing.get('eli5_summary_nl'):
-                            article_data['eli5_summary_nl'] = existing['eli5_summary_nl']
-                        storage.upsert_article(article_data)
-                        updated_count += 1
-                    else:
-                        storage.upsert_article(article_data)
-                        inserted_count += 1
-                elif isinstance(storage, SupabaseClient):
-                    # Supabase: check if exists by stable_id
-                    try:
-                        # Check if article exists by stable_id
-                        response = storage.client.table('articles').select('id, eli5_summary_nl').eq('stable_id', article_data['stable_id']).execute()
-                        
-                        if response.data and len(response.data) > 0:
-                            # Update existing article (but preserve ELI5 if it exists)
-                            if response.data[0].get('eli5_summary_nl'):
-                                article_data['eli5_summary_nl'] = response.data[0]['eli5_summary_nl']
-                            
-                            storage.upsert_article(article_data)
-                            updated_count += 1
-                        else:
-                            # Insert new article
-                            storage.upsert_article(article_data)
-                            inserted_count += 1
-                    except Exception as e:
-                        print(f"Error checking/upserting article in Supabase: {e}")
-                        storage.upsert_article(article_data)
-                        inserted_count += 1
-                else:
-                    # Unknown storage type, try to upsert anyway
-                    storage.upsert_article(article_data)
+                if storage.upsert_article(article_data):
                     inserted_count += 1
+                else:
+                    error_count += 1
                     
             except Exception as e:
                 print(f"Error processing entry: {e}")
-                skipped_count += 1
+                error_count += 1
                 continue
         
         return {
             'success': True,
             'fetched': fetched_count,
             'inserted': inserted_count,
-            'updated': updated_count,
-            'skipped': skipped_count
+            'skipped': skipped_count,
+            'errors': error_count
         }
         
     except Exception as e:
@@ -248,11 +239,46 @@ def fetch_and_upsert_articles(feed_url: str, max_items: Optional[int] = None, us
             'error': str(e),
             'fetched': 0,
             'inserted': 0,
-            'updated': 0,
-            'skipped': 0
+            'skipped': 0,
+            'errors': 0
         }
 
 
+def fetch_and_upsert_feeds(feed_urls: List[str], max_items: Optional[int] = None,
+                           use_llm_categorization: bool = False) -> Dict[str, Any]:
+    """
+    Fetch several RSS feeds concurrently and upsert their articles.
+    
+    Feeds are independent and network-bound, so they run in parallel
+    (one worker per feed); a failing feed doesn't stop the others.
+    
+    Returns:
+        Dict with summed fetched, inserted, skipped and errors counts
+    """
+    totals = {'fetched': 0, 'inserted': 0, 'skipped': 0, 'errors': 0}
+    if not feed_urls:
+        return totals
+    
+    with ThreadPoolExecutor(max_workers=len(feed_urls)) as executor:
+        futures = {
+            executor.submit(fetch_and_upsert_articles, feed_url, max_items, use_llm_categorization): feed_url
+            for feed_url in feed_urls
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error fetching {futures[future]}: {e}")
+                continue
+            if result.get('success'):
+                for key in totals:
+                    totals[key] += result.get(key, 0)
+            else:
+                print(f"Error fetching {futures[future]}: {result.get('error')}")
+    
+    return totals
+
+
 def generate_missing_eli5_summaries(limit: int = 5) -> int:
     """
     Generate ELI5 summaries for articles that don't have them yet.
@@ -273,13 +299,13 @@ def generate_missing_eli5_summaries(limit: int = 5) -> int:
                 if article.get('full_content'):
                     text += f" {article.get('full_content', '')[:1000]}"
                 
-                eli5_summary = generate_eli5_summary_nl(
+                result = generate_eli5_summary_nl_with_llm(
                     text,
                     article.get('title', '')
                 )
                 
-                if eli5_summary:
-                    storage.update_article_eli5(article['id'], eli5_summary)
+                if result and result.get('summary'):
+                    storage.update_article_eli5(article['id'], result['summary'], result.get('llm'))
                     generated_count += 1
             except Exception as e:
                 print(f"Error generating ELI5 for article {article.get('id')}: {e}")
@@ -290,7 +316,8 @@ def generate_missing_eli5_summaries(limit: int = 5) -> int:
     return generated_count
 
 
-def recategorize_all_articles(limit: int = None, use_llm: bool = True, progress_callback=None) -> Dict[str, Any]:
+def recategorize_all_articles(limit: int = None, use_llm: bool = True, progress_callback=None,
+                              batch_size: int = 50, max_workers: int = 8) -> Dict[str, Any]:
     """
     Recategorize all existing articles using LLM or keywords.
     
@@ -298,6 +325,8 @@ def recategorize_all_articles(limit: int = None, use_llm: bool = True, progress_
         limit: Maximum number of articles to recategorize (None for all, default: 50)
         use_llm: Whether to use LLM categorization (True) or keywords (False)
         progress_callback: Optional callback function(processed, total, current_title) for progress updates
+        batch_size: Number of recategorized articles written per storage request (default: 50)
+        max_workers: Number of concurrent LLM requests (default: 8; keyword mode runs inline)
     
     Returns:
         Dict with counts of processed, updated, errors
@@ -325,82 +354,96 @@ def recategorize_all_articles(limit: int = None, use_llm: bool = True, progress_
         processed = 0
         updated = 0
         errors = 0
+        pending = []
+        
+        def flush_pending():
+            nonlocal updated, errors
+            if not pending:
+                return
+            if storage.update_article_categories(pending):
+                updated += len(pending)
+            else:
+                errors += len(pending)
+            pending.clear()
         
-        for idx, article in enumerate(all_articles, 1):
+        def categorize_one(article):
+            """Return (categories, llm) for one article, falling back to keywords if the LLM fails."""
+            title = article.get('title') or ''
+            description = article.get('description') or ''
+            content = article.get('full_content') or ''
+            
+            if use_llm:
+                try:
+                    # Try categorization (has built-in timeout handling)
+                    result = categorize_article(title, description, content)
+                    
+                    if result:
+                        if isinstance(result, dict):
+                            return result.get('categories', [])[:3], result.get('llm', 'Keywords')  # Limit to 3
+                        return (result if isinstance(result, list) else [])[:3], 'Keywords'
+                except TimeoutError:
+                    print(f"  ⚠️ LLM categorization timeout for article {article.get('id', 'unknown')}")
+                except Exception as llm_error:
+                    print(f"  ⚠️ LLM categorization failed for article {article.get('id', 'unknown')}: {llm_error}")
+            
+            # Keywords (requested, or fallback if the LLM failed)
+            return _categorize_with_keywords(title, description, content)[:3], 'Keywords'
+        
+        def handle_result(article, get_result):
+            """Queue the write for one categorized article; get_result() returns (categories, llm)."""
+            nonlocal processed, errors
+            
+            # Update progress
+            if progress_callback:
+                progress_callback(processed, total_articles, (article.get('title') or '')[:50])
+            
             try:
-                title = article.get('title') or ''
-                description = article.get('description') or ''
-                content = article.get('full_content') or ''
-                
-                # Ensure we have at least a title
-                if not title:
-                    print(f"  ⚠️ Skipping article {article.get('id', 'unknown')}: no title")
-                    errors += 1
-                    processed += 1
-                    continue
-                
-                # Update progress
-                if progress_callback:
-                    progress_callback(processed, total_articles, title[:50])
-                
-                # Recategorize
-                if use_llm:
-                    try:
-                        # Try categorization (has built-in timeout handling)
-                        result = categorize_article(title, description, content)
-                        
-                        if result:
-                            if isinstance(result, dict):
-                                new_categories = result.get('categories', [])[:3]  # Limit to 3
-                                categorization_llm = result.get('llm', 'Keywords')
-                            else:
-                                new_categories = (result if isinstance(result, list) else [])[:3]  # Limit to 3
-                                categorization_llm = 'Keywords'
-                        else:
-                            # Fall back to keywords if LLM failed
-                            from categorization_engine import _categorize_with_keywords
-                            new_categories = _categorize_with_keywords(title, description, content)[:3]  # Limit to 3
-                            categorization_llm = 'Keywords'
-                    except TimeoutError:
-                        print(f"  ⚠️ LLM categorization timeout for article {article.get('id', 'unknown')}")
-                        # Fall back to keywords
-                        from categorization_engine import _categorize_with_keywords
-                        new_categories = _categorize_with_keywords(title, description, content)[:3]  # Limit to 3
-                        categorization_llm = 'Keywords'
-                    except Exception as llm_error:
-                        print(f"  ⚠️ LLM categorization failed for article {article.get('id', 'unknown')}: {llm_error}")
-                        # Fall back to keywords
-                        from categorization_engine import _categorize_with_keywords
-                        new_categories = _categorize_with_keywords(title, description, content)[:3]  # Limit to 3
-                        categorization_llm = 'Keywords'
-                else:
-                    from categorization_engine import _categorize_with_keywords
-                    new_categories = _categorize_with_keywords(title, description, content)[:3]  # Limit to 3
-                    categorization_llm = 'Keywords'
+                new_categories, categorization_llm = get_result()
                 
                 # Ensure we have at least one category
                 if not new_categories:
                     new_categories = ['binnenland']  # Default category
                 
-                # Limit to maximum 3 categories
-                new_categories = new_categories[:3]
-                
-                # Update article
-                article['categories'] = new_categories
-                article['categorization_llm'] = categorization_llm
-                
-                if storage.upsert_article(article):
-                    updated += 1
-                else:
-                    errors += 1
-                
-                processed += 1
+                # Writes are batched and only touch the category columns, so
+                # ELI5 summaries stored meanwhile are not overwritten
+                pending.append({
+                    'id': article['id'],
+                    'stable_id': article.get('stable_id'),
+                    'categories': new_categories,
+                    'categorization_llm': categorization_llm
+                })
+                if len(pending) >= batch_size:
+                    flush_pending()
                 
             except Exception as e:
                 print(f"Error recategorizing article {article.get('id', 'unknown')}: {e}")
                 errors += 1
+            processed += 1
+        
+        to_categorize = []
+        for article in all_articles:
+            # Ensure we have at least a title
+            if not article.get('title'):
+                print(f"  ⚠️ Skipping article {article.get('id', 'unknown')}: no title")
+                errors += 1
                 processed += 1
                 continue
+            to_categorize.append(article)
+        
+        if use_llm:
+            # LLM calls are I/O-bound: run them concurrently and handle the results
+            # on this thread as they complete, so progress and writes stay sequential.
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(categorize_one, article): article for article in to_categorize}
+                for future in as_completed(futures):
+                    handle_result(futures[future], future.result)
+        else:
+            # Keyword categorization is CPU-bound and holds the GIL: threads would only add overhead
+            for article in to_categorize:
+                handle_result(article, lambda article=article: categorize_one(article))
+        
+        # Write the remaining articles
+        flush_pending()
         
         return {
             'success': True,
@@ -420,7 +463,8 @@ def recategorize_all_articles(limit: int = None, use_llm: bool = True, progress_
         }
 
 
-def recategorize_articles_without_llm(limit: int = 50, progress_callback=None) -> Dict[str, Any]:
+def recategorize_articles_without_llm(limit: int = 50, progress_callback=None, batch_size: int = 50,
+                                      max_workers: int = 8) -> Dict[str, Any]:
     """
     Recategorize articles that don't have LLM-based categorization.
     Only processes articles where categorization_llm is 'Keywords' or None.
@@ -429,6 +473,8 @@ def recategorize_articles_without_llm(limit: int = 50, progress_callback=None) -
     Args:
         limit: Maximum number of articles to recategorize (default: 50)
         progress_callback: Optional callback function(processed, total, current_title) for progress updates
+        batch_size: Number of recategorized articles written per storage request (default: 50)
+        max_workers: Number of concurrent LLM requests (default: 8)
     
     Returns:
         Dict with counts of processed, updated, errors, skipped
@@ -487,26 +533,47 @@ def recategorize_articles_without_llm(limit: int = 50, progress_callback=None) -
         processed = 0
         updated = 0
         errors = 0
+        pending = []
         
-        for idx, article in enumerate(articles_to_recategorize[:limit], 1):
-            try:
-                title = article.get('title') or ''
-                description = article.get('description') or ''
-                content = article.get('full_content') or ''
-                
+        def flush_pending():
+            nonlocal updated, errors
+            if not pending:
+                return
+            if storage.update_article_categories(pending):
+                updated += len(pending)
+            else:
+                errors += len(pending)
+            pending.clear()
+        
+        def categorize_one(article):
+            return categorize_article(
+                article.get('title') or '',
+                article.get('description') or '',
+                article.get('full_content') or ''
+            )
+        
+        # LLM calls are I/O-bound: run them concurrently and handle the results
+        # on this thread as they complete, so progress and writes stay sequential
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for article in articles_to_recategorize[:limit]:
                 # Ensure we have at least a title
-                if not title:
+                if not article.get('title'):
                     errors += 1
                     processed += 1
                     continue
+                futures[executor.submit(categorize_one, article)] = article
+            
+            for future in as_completed(futures):
+                article = futures[future]
+                title = article.get('title') or ''
                 
                 # Update progress
                 if progress_callback:
                     progress_callback(processed, total_to_process, title[:50])
                 
-                # Recategorize with LLM
                 try:
-                    result = categorize_article(title, description, content)
+                    result = future.result()
                     
                     if result:
                         if isinstance(result, dict):
@@ -530,14 +597,15 @@ def recategorize_articles_without_llm(limit: int = 50, progress_callback=None) -
                         # Limit to maximum 3 categories
                         new_categories = new_categories[:3]
                         
-                        # Update article
-                        article['categories'] = new_categories
-                        article['categorization_llm'] = categorization_llm
-                        
-                        if storage.upsert_article(article):
-                            updated += 1
-                        else:
-                            errors += 1
+                        # Writes are batched and only touch the category columns
+                        pending.append({
+                            'id': article['id'],
+                            'stable_id': article.get('stable_id'),
+                            'categories': new_categories,
+                            'categorization_llm': categorization_llm
+                        })
+                        if len(pending) >= batch_size:
+                            flush_pending()
                     else:
                         # LLM wasn't actually used, skip
                         errors += 1
@@ -547,11 +615,8 @@ def recategorize_articles_without_llm(limit: int = 50, progress_callback=None) -
                     errors += 1
                 
                 processed += 1
-                
-            except Exception as e:
-                errors += 1
-                processed += 1
-                continue
+        
+        flush_pending()
         
         return {
             'success': True,
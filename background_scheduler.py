@@ -17,7 +17,10 @@ try:
 except ImportError:
     pass
 
-from articles_repository import fetch_and_upsert_articles
+from articles_repository import fetch_and_upsert_feeds, generate_missing_eli5_summaries
+
+# ELI5 summaries generated per scheduler tick, so article pages rarely wait on an LLM
+ELI5_BATCH_SIZE = 20
 
 # File to store last fetch time (persists across app restarts)
 LAST_FETCH_FILE = Path(__file__).parent / ".last_fetch_time"
@@ -53,26 +56,25 @@ def fetch_articles_background():
             'https://feeds.nos.nl/nosnieuwsbuitenland',
         ]
         
-        total_inserted = 0
-        total_updated = 0
-        
-        for feed_url in feed_urls:
-            try:
-                # Use LLM categorization for better accuracy
-                result = fetch_and_upsert_articles(feed_url, max_items=30, use_llm_categorization=True)
-                if result.get('success'):
-                    total_inserted += result.get('inserted', 0)
-                    total_updated += result.get('updated', 0)
-            except Exception as e:
-                # Silently log errors but continue
-                print(f"Background fetch error for {feed_url}: {e}")
-                pass
+        # Feeds are fetched concurrently; use LLM categorization for better accuracy
+        totals = fetch_and_upsert_feeds(feed_urls, max_items=30, use_llm_categorization=True)
+        total_inserted = totals['inserted']
         
         # Update last fetch time
         set_last_fetch_time(time.time())
         
-        if total_inserted > 0 or total_updated > 0:
-            print(f"[Background] Fetched {total_inserted} new articles, {total_updated} updated")
+        if total_inserted > 0:
+            print(f"[Background] Fetched {total_inserted} new articles")
+        if totals['errors'] > 0:
+            print(f"[Background] {totals['errors']} feed entries could not be stored")
+        
+        # Summarize new articles here instead of in the page render
+        generated = generate_missing_eli5_summaries(limit=ELI5_BATCH_SIZE)
+        if generated > 0:
+            print(f"[Background] Generated {generated} ELI5 summaries")
+        
+        if total_inserted > 0 or generated > 0:
+            _mark_data_changed()
         
     except Exception as e:
         print(f"[Background] Error fetching articles: {e}")
@@ -110,26 +112,50 @@ def background_scheduler_worker():
 # Global thread variable
 _scheduler_thread = None
 _scheduler_running = False
+_scheduler_lock = threading.Lock()
+
+# Bumped whenever a background run stores new data; the app compares it to drop stale caches
+_data_version = 0.0
+
+
+def _mark_data_changed():
+    """Record that stored articles changed."""
+    global _data_version
+    _data_version = time.time()
+
+
+def get_data_version() -> float:
+    """Timestamp of the last background run that changed stored articles (0.0 if none yet)."""
+    return _data_version
 
 
 def start_background_scheduler():
-    """Start the background scheduler thread."""
+    """
+    Start the background scheduler thread.
+    
+    Cheap to call on every Streamlit rerun: once started this is a single flag
+    check. The lock keeps concurrent sessions from starting a second thread.
+    """
     global _scheduler_thread, _scheduler_running
     
     if _scheduler_running:
         return  # Already running
     
-    try:
-        _scheduler_thread = threading.Thread(
-            target=background_scheduler_worker,
-            daemon=True,  # Dies when main thread dies
-            name="RSSBackgroundScheduler"
-        )
-        _scheduler_thread.start()
-        _scheduler_running = True
-        print("[Background] RSS feed scheduler started (checks every 15 minutes)")
-    except Exception as e:
-        print(f"[Background] Failed to start scheduler: {e}")
+    with _scheduler_lock:
+        if _scheduler_running:
+            return  # Started by another session meanwhile
+        
+        try:
+            _scheduler_thread = threading.Thread(
+                target=background_scheduler_worker,
+                daemon=True,  # Dies when main thread dies
+                name="RSSBackgroundScheduler"
+            )
+            _scheduler_thread.start()
+            _scheduler_running = True
+            print("[Background] RSS feed scheduler started (checks every 15 minutes)")
+        except Exception as e:
+            print(f"[Background] Failed to start scheduler: {e}")
 
 
 def is_scheduler_running() -> bool:
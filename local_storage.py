@@ -5,11 +5,14 @@ Uses SQLite database for articles and JSON file for user preferences.
 import os
 import sqlite3
 import json
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 import hashlib
 
+from nlp_utils import blacklist_matcher, article_search_text
+from categorization_engine import CATEGORIES, get_all_categories
+
 
 class LocalStorage:
     """Local storage implementation for testing without Supabase."""
@@ -37,6 +40,7 @@ class LocalStorage:
                 source TEXT DEFAULT 'NOS',
                 published_at TEXT,
                 full_content TEXT,
+                summary_plain TEXT,
                 image_url TEXT,
                 category TEXT,
                 categories TEXT,
@@ -56,6 +60,8 @@ class LocalStorage:
                 cursor.execute("ALTER TABLE articles ADD COLUMN categories TEXT")
             if 'categorization_llm' not in columns:
                 cursor.execute("ALTER TABLE articles ADD COLUMN categorization_llm TEXT")
+            if 'summary_plain' not in columns:
+                cursor.execute("ALTER TABLE articles ADD COLUMN summary_plain TEXT")
         except Exception:
             pass  # Column might already exist or table doesn't exist yet
         
@@ -106,14 +112,12 @@ class LocalStorage:
                     prefs = all_prefs[user_id]
                     # Ensure selected_categories exists
                     if 'selected_categories' not in prefs:
-                        from categorization_engine import get_all_categories
                         prefs['selected_categories'] = get_all_categories()
                     return prefs
         except Exception:
             pass
         
         # Return defaults
-        from categorization_engine import get_all_categories
         return {
             "user_id": user_id,
             "blacklist_keywords": ["Trump", "Rusland", "Soedan", "aanslag"],
@@ -167,7 +171,7 @@ class LocalStorage:
                 cursor.execute("""
                     UPDATE articles SET
                         title = ?, description = ?, url = ?, source = ?,
-                        published_at = ?, full_content = ?, image_url = ?,
+                        published_at = ?, full_content = ?, summary_plain = ?, image_url = ?,
                         category = ?, categories = ?, categorization_llm = ?,
                         eli5_summary_nl = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE stable_id = ?
@@ -178,6 +182,7 @@ class LocalStorage:
                     article_data.get('source', 'NOS'),
                     article_data.get('published_at'),
                     article_data.get('full_content'),
+                    article_data.get('summary_plain'),
                     article_data.get('image_url'),
                     article_data.get('category'),
                     categories_json,
@@ -192,9 +197,9 @@ class LocalStorage:
                 cursor.execute("""
                     INSERT INTO articles (
                         id, stable_id, title, description, url, source,
-                        published_at, full_content, image_url, category,
+                        published_at, full_content, summary_plain, image_url, category,
                         categories, categorization_llm, eli5_summary_nl, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                 """, (
                     article_id,
                     article_data['stable_id'],
@@ -204,6 +209,7 @@ class LocalStorage:
                     article_data.get('source', 'NOS'),
                     article_data.get('published_at'),
                     article_data.get('full_content'),
+                    article_data.get('summary_plain'),
                     article_data.get('image_url'),
                     article_data.get('category'),
                     categories_json,
@@ -218,6 +224,43 @@ class LocalStorage:
             print(f"Error upserting article: {e}")
             return False
     
+    def update_article_categories(self, updates: List[Dict[str, Any]]) -> bool:
+        """Write only categories and categorization_llm for several articles."""
+        if not updates:
+            return True
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(
+                "UPDATE articles SET categories = ?, categorization_llm = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                [
+                    (
+                        json.dumps(update['categories']) if update.get('categories') else None,
+                        update.get('categorization_llm') or 'Keywords',
+                        update['id']
+                    )
+                    for update in updates
+                ]
+            )
+            conn.commit()
+            conn.close()
+            return True
+        except Exception as e:
+            print(f"Error updating article categories: {e}")
+            return False
+    
+    def get_existing_stable_ids(self, stable_ids: List[str]) -> set:
+        """Return the subset of stable_ids that already exist (single query)."""
+        if not stable_ids:
+            return set()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            placeholders = ", ".join("?" for _ in stable_ids)
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT stable_id FROM articles WHERE stable_id IN ({placeholders})", list(stable_ids))
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+    
     def get_articles(
         self,
         limit: int = 50,
@@ -259,57 +302,131 @@ class LocalStorage:
                     article['categories'] = []
                 articles.append(article)
             
-            # Filter by categories array (if provided)
-            if categories:
-                filtered = []
-                for article in articles:
-                    article_categories = article.get('categories', []) or []
-                    # Check if any of the requested categories match
-                    if any(cat in article_categories for cat in categories):
-                        filtered.append(article)
-                articles = filtered
-            
-            # Apply search filter
-            if search_query:
-                search_lower = search_query.lower()
-                articles = [
-                    a for a in articles
-                    if search_lower in (a.get('title', '') or '').lower() or
-                       search_lower in (a.get('description', '') or '').lower() or
-                       search_lower in (a.get('full_content', '') or '').lower()
-                ]
+            conn.close()
+            return self._filter_articles(articles, categories, search_query, blacklist_keywords)
+        except Exception as e:
+            print(f"Error getting articles: {e}")
+            return []
+    
+    def get_articles_page(
+        self,
+        limit: int = 25,
+        cursor: Optional[Tuple[str, str]] = None,
+        categories: Optional[List[str]] = None,
+        blacklist_keywords: Optional[List[str]] = None,
+        max_reads: int = 8
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Get one page of articles using keyset (cursor) pagination on (published_at, id).
+        
+        Reads chunks of `limit` rows until `limit` articles pass the filters, the
+        table runs out, or `max_reads` chunks have been read.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor_db = conn.cursor()
             
-            # Apply blacklist filter
-            if blacklist_keywords:
-                filtered = []
-                for article in articles:
-                    # Check title, description, and full_content
-                    title = (article.get('title', '') or '').lower()
-                    description = (article.get('description', '') or '').lower()
-                    full_content = (article.get('full_content', '') or '').lower()
-                    
-                    # Combine all text for checking
-                    all_text = f"{title} {description} {full_content}"
-                    
-                    should_include = True
-                    
-                    # Check each keyword (case-insensitive)
-                    for keyword in blacklist_keywords:
-                        keyword_lower = keyword.lower().strip()
-                        if keyword_lower and keyword_lower in all_text:
-                            should_include = False
-                            break
-                    
-                    if should_include:
-                        filtered.append(article)
+            articles = []
+            for _ in range(max_reads):
+                query = "SELECT * FROM articles"
+                params = []
+                if cursor:
+                    query += " WHERE published_at < ? OR (published_at = ? AND id < ?)"
+                    params.extend([cursor[0], cursor[0], cursor[1]])
+                query += " ORDER BY published_at DESC, id DESC LIMIT ?"
+                params.append(limit)
+                
+                cursor_db.execute(query, params)
+                rows = [dict(row) for row in cursor_db.fetchall()]
+                
+                for article in rows:
+                    try:
+                        article['categories'] = json.loads(article['categories']) if article.get('categories') else []
+                    except Exception:
+                        article['categories'] = []
                 
-                articles = filtered
+                cursor = None
+                if len(rows) == limit and rows[-1].get('published_at'):
+                    cursor = (rows[-1]['published_at'], rows[-1]['id'])
+                
+                articles.extend(self._filter_articles(rows, categories=categories, blacklist_keywords=blacklist_keywords))
+                if len(articles) > limit and articles[limit - 1].get('published_at'):
+                    # Continue right after the last article shown
+                    last = articles[limit - 1]
+                    conn.close()
+                    return articles[:limit], (last['published_at'], last['id'])
+                if len(articles) >= limit or cursor is None:
+                    break
             
             conn.close()
-            return articles
+            return articles, cursor
         except Exception as e:
-            print(f"Error getting articles: {e}")
+            print(f"Error getting articles page: {e}")
+            return [], None
+    
+    def _filter_articles(
+        self,
+        articles: List[Dict[str, Any]],
+        categories: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        blacklist_keywords: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Apply categories, search and blacklist filters in Python."""
+        # Filter by categories array (if provided)
+        if categories:
+            filtered = []
+            for article in articles:
+                article_categories = article.get('categories', []) or []
+                # Check if any of the requested categories match
+                if any(cat in article_categories for cat in categories):
+                    filtered.append(article)
+            articles = filtered
+        
+        is_blacklisted = blacklist_matcher(blacklist_keywords)
+        if not search_query and not is_blacklisted:
+            return articles
+        
+        # Search and blacklist filters share one lowercased text per article
+        search_lower = search_query.lower() if search_query else None
+        filtered = []
+        for article in articles:
+            all_text = article_search_text(article)
+            if search_lower and search_lower not in all_text:
+                continue
+            if is_blacklisted and is_blacklisted(all_text):
+                continue
+            filtered.append(article)
+        
+        return filtered
+    
+    def get_filtered_out_articles(
+        self,
+        blacklist_keywords: Optional[List[str]] = None,
+        selected_categories: Optional[List[str]] = None,
+        limit: int = 200
+    ) -> List[Dict[str, Any]]:
+        """Get articles that the user's filters would hide (blacklist or unselected category)."""
+        is_blacklisted = blacklist_matcher(blacklist_keywords)
+        selected_lower = {cat.lower().strip() for cat in (selected_categories or []) if cat}
+        deselected = {cat.lower().strip() for cat in CATEGORIES} - selected_lower if selected_lower else set()
+        
+        if not is_blacklisted and not deselected:
             return []
+        
+        filtered = []
+        for article in self.get_articles(limit=limit):
+            article_cats = list(article.get('categories') or [])
+            if article.get('category'):
+                article_cats.append(article['category'])
+            if not deselected.isdisjoint(cat.lower().strip() for cat in article_cats if cat):
+                filtered.append(article)
+                continue
+            
+            if is_blacklisted and is_blacklisted(article_search_text(article)):
+                filtered.append(article)
+        
+        return filtered
     
     def get_article_by_id(self, article_id: str) -> Optional[Dict[str, Any]]:
         """Get a single article by ID."""
@@ -2,10 +2,38 @@
 NLP utilities for generating ELI5 summaries using free LLM APIs.
 """
 import os
-from typing import Optional, Dict, Any
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from html import unescape
+from typing import Optional, Dict, Any, Callable
 import requests
 import json
 
+# Optional: Aho-Corasick automaton for blacklist matching (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Compiled once at import; strip_html_tags runs for every article summary
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Sentence endings for get_summary_sentences (strict: followed by a capital letter)
+_SENTENCE_END_RE = re.compile(r'([.!?]+)\s+(?=[A-Z]|$)')
+_LOOSE_SENTENCE_END_RE = re.compile(r'([.!?]+)\s+')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s+')
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+# Recent ELI5 results keyed by normalized title + opening text, so the same story
+# published in several feeds (or re-fetched with small edits) costs one LLM call
+ELI5_CACHE_SIZE = 256
+ELI5_CACHE_PREFIX_CHARS = 500
+_eli5_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_eli5_cache_lock = threading.Lock()
+
 
 def generate_eli5_summary_nl(article_text: str, title: str = "") -> Optional[str]:
     """
@@ -34,6 +62,32 @@ def generate_eli5_summary_nl_with_llm(article_text: str, title: str = "") -> Opt
     Returns:
         Dict with 'summary' and 'llm' keys, or None if generation fails
     """
+    key = _eli5_cache_key(article_text, title)
+    with _eli5_cache_lock:
+        cached = _eli5_cache.get(key)
+        if cached is not None:
+            _eli5_cache.move_to_end(key)
+            return dict(cached)
+    
+    result = _generate_eli5_uncached(article_text, title)
+    # Only LLM output is worth caching; the simple extraction is cheap to redo
+    if result and result['llm'] != 'Simple':
+        with _eli5_cache_lock:
+            _eli5_cache[key] = dict(result)
+            if len(_eli5_cache) > ELI5_CACHE_SIZE:
+                _eli5_cache.popitem(last=False)
+    return result
+
+
+def _eli5_cache_key(article_text: str, title: str) -> str:
+    """Hash of the lowercased words of the title and opening text (punctuation and markup ignored)."""
+    text = f"{title} {strip_html_tags(article_text or '')[:ELI5_CACHE_PREFIX_CHARS]}".lower()
+    normalized = ' '.join(_NON_WORD_RE.sub(' ', text).split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def _generate_eli5_uncached(article_text: str, title: str) -> Optional[Dict[str, Any]]:
+    """Try the configured LLM providers in order, falling back to simple extraction."""
     # Try different free LLM APIs in order of preference
     
     # Option 1: Hugging Face Inference API (free tier, reliable)
@@ -258,9 +312,9 @@ def _generate_with_groq(text: str, title: str, api_key: str) -> Optional[str]:
     """Generate summary using Groq API (fast and free tier available)."""
     try:
         import groq
-        from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
         
-        client = groq.Groq(api_key=api_key)
+        # The client enforces the timeout on the HTTP request itself
+        client = groq.Groq(api_key=api_key, timeout=30.0, max_retries=0)
         
         prompt = f"""Leg dit nieuwsartikel uit alsof ik 5 jaar ben. Gebruik heel eenvoudige Nederlandse woorden die een 5-jarige begrijpt. Gebruik korte zinnen (2-3 zinnen).
 
@@ -272,33 +326,24 @@ Inhoud: {text[:2000]}
 
 Samenvatting:"""
         
-        def make_request():
-            return client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Je bent een vriendelijke assistent die nieuwsartikelen uitlegt aan kinderen van 5 jaar oud. Gebruik altijd heel eenvoudige Nederlandse woorden en korte zinnen. Leg namen en bedrijfsnamen met een hoofdletter uit in simpele woorden (behalve bekende landen zoals Nederland, Frankrijk)."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model="llama-3.1-8b-instant",  # Free fast model
-                temperature=0.7,
-                max_tokens=150
-            )
+        chat_completion = client.chat.completions.create(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Je bent een vriendelijke assistent die nieuwsartikelen uitlegt aan kinderen van 5 jaar oud. Gebruik altijd heel eenvoudige Nederlandse woorden en korte zinnen. Leg namen en bedrijfsnamen met een hoofdletter uit in simpele woorden (behalve bekende landen zoals Nederland, Frankrijk)."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            model="llama-3.1-8b-instant",  # Free fast model
+            temperature=0.7,
+            max_tokens=150
+        )
         
-        # Use ThreadPoolExecutor with timeout (30 seconds)
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(make_request)
-            try:
-                chat_completion = future.result(timeout=30.0)
-                summary = chat_completion.choices[0].message.content.strip()
-                return summary
-            except FutureTimeoutError:
-                print("Groq API timeout (30s)")
-                return None
+        summary = chat_completion.choices[0].message.content.strip()
+        return summary
     except ImportError:
         print("Groq library not installed. Install with: pip install groq")
     except Exception as e:
@@ -363,16 +408,113 @@ def _simple_extract_summary(text: str) -> Optional[str]:
         return None
     
     # Split by sentence endings
-    import re
-    sentences = re.split(r'[.!?]+\s+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
     
     # Take first 2-3 sentences
     if len(sentences) >= 2:
         summary = '. '.join(sentences[:2])
-        if summary and not summary[-1] in '.!?':
+        if summary and not summary.endswith(('.', '!', '?')):
             summary += '.'
         return summary
     
-    return text[:200] + "..." if len(text) > 200 else text
+    return f"{text[:200]}..." if len(text) > 200 else text
+
+
+def strip_html_tags(text: str) -> str:
+    """Remove HTML tags from text (for summary extraction)."""
+    if not text:
+        return ""
+    if '<' not in text and '&' not in text:
+        # Plain text: no tags to strip or entities to unescape
+        return _WS_RE.sub(' ', text).strip()
+    text = _TAG_RE.sub('', text)
+    text = unescape(text)
+    text = _WS_RE.sub(' ', text)
+    return text.strip()
+
+
+def _sentence_ends(pattern: re.Pattern, text: str, limit: int) -> list:
+    """Offsets just past the punctuation of the first `limit` sentence endings (lazy scan)."""
+    ends = []
+    for match in pattern.finditer(text):
+        ends.append(match.end(1))
+        if len(ends) >= limit:
+            break
+    return ends
+
+
+def get_summary_sentences(text: str, num_sentences: int = 3) -> str:
+    """Extract first N complete sentences from text."""
+    if not text:
+        return ""
+    text = strip_html_tags(text)
+    if not text:
+        return ""
+    
+    # Prefer sentence endings followed by a capital letter, then any sentence ending.
+    # Only scan as far as the Nth ending instead of splitting the whole article.
+    for pattern in (_SENTENCE_END_RE, _LOOSE_SENTENCE_END_RE):
+        ends = _sentence_ends(pattern, text, num_sentences)
+        if len(ends) >= num_sentences:
+            return text[:ends[-1]].strip()
+        # The text after the last ending counts as a final sentence
+        tail = text[ends[-1]:] if ends else text
+        if len(ends) + bool(tail.strip()) >= num_sentences:
+            break
+    
+    # Fewer than N sentences: return all of them
+    summary = text.strip()
+    # Ensure it ends with punctuation
+    if not summary.endswith(('.', '!', '?')):
+        summary += '.'
+    return summary
+
+
+def article_search_text(article: Dict[str, Any]) -> str:
+    """Lowercased title, description and full_content of an article, for keyword matching."""
+    return f"{article.get('title') or ''} {article.get('description') or ''} {article.get('full_content') or ''}".lower()
+
+
+@lru_cache(maxsize=64)
+def _compile_blacklist_pattern(keywords: tuple) -> Optional["re.Pattern"]:
+    cleaned = sorted({kw.lower().strip() for kw in keywords if kw and kw.strip()}, key=len, reverse=True)
+    if not cleaned:
+        return None
+    return re.compile('|'.join(re.escape(kw) for kw in cleaned))
 
+
+def compile_blacklist(keywords) -> Optional["re.Pattern"]:
+    """
+    Compile blacklist keywords into one regex matched against lowercased text.
+    
+    All keywords are checked in a single pass instead of one substring scan per
+    keyword. Compiled patterns are cached, so this is only rebuilt when the
+    blacklist changes. Returns None if there are no usable keywords.
+    """
+    return _compile_blacklist_pattern(tuple(keywords or ()))
+
+
+@lru_cache(maxsize=64)
+def _build_blacklist_matcher(keywords: tuple) -> Optional[Callable[[str], bool]]:
+    pattern = _compile_blacklist_pattern(keywords)
+    if pattern is None:
+        return None
+    if ahocorasick is None:
+        return lambda text: pattern.search(text) is not None
+    automaton = ahocorasick.Automaton()
+    for kw in {kw.lower().strip() for kw in keywords if kw and kw.strip()}:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
+
+def blacklist_matcher(keywords) -> Optional[Callable[[str], bool]]:
+    """
+    Return a function that tells whether lowercased text contains any blacklist keyword.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed (one C-level
+    scan that stops at the first hit), otherwise the compile_blacklist() regex.
+    Cached per blacklist. Returns None if there are no usable keywords.
+    """
+    return _build_blacklist_matcher(tuple(keywords or ()))
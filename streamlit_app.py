@@ -4,10 +4,15 @@ Pages: Nieuws, Waarom?, Gebruiker
 """
 import os
 import sys
+import json
+import base64
+import mimetypes
 from pathlib import Path
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
+import pandas as pd
 import pytz
+from dateutil import parser as dateutil_parser
 
 # Add project root to Python path
 BASE_DIR = Path(__file__).resolve().parent
@@ -20,13 +25,76 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, skip .env loading
 
+# PyJWT is optional: without it session restore always asks Supabase Auth
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
 import streamlit as st
+import streamlit.components.v1 as components
 import re
-from html import unescape
-from supabase_client import get_supabase_client
-from articles_repository import fetch_and_upsert_articles, generate_missing_eli5_summaries
-from nlp_utils import generate_eli5_summary_nl_with_llm
-from background_scheduler import start_background_scheduler, is_scheduler_running
+import time
+import traceback
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from html import escape, unescape
+from supabase_client import get_supabase_client, SupabaseClient
+try:
+    from local_storage import LocalStorage
+except ImportError:
+    LocalStorage = None  # Only needed to detect the local fallback
+from articles_repository import fetch_and_upsert_feeds, generate_missing_eli5_summaries, recategorize_articles_without_llm
+from nlp_utils import generate_eli5_summary_nl_with_llm, get_summary_sentences, compile_blacklist
+from background_scheduler import start_background_scheduler, get_data_version
+from categorization_engine import CATEGORIES, is_llm_available
+
+# Mock accounts for local testing; never logged in or restored automatically
+BLOCKED_EMAILS = frozenset({'test@local.com'})
+
+# Cookie that holds the login session (access token, refresh token and email)
+AUTH_COOKIE = "sb_auth"
+# Separate cookies written by older versions; still read once and cleared
+LEGACY_AUTH_COOKIES = ("supabase_access_token", "supabase_refresh_token", "user_email")
+AUTH_COOKIES = (AUTH_COOKIE,) + LEGACY_AUTH_COOKIES
+
+# Display timezone, resolved once at import
+AMSTERDAM_TZ = pytz.timezone('Europe/Amsterdam')
+
+# Number of articles read per "Meer laden" page
+ARTICLES_PAGE_SIZE = 25
+
+# Article content longer than this is shown as a preview plus an expander
+CONTENT_PREVIEW_CHARS = 5000
+
+# Periods (in days) offered by the statistics panel
+STATS_PERIOD_DAYS = (7, 14, 30)
+
+# Lowercased valid category names, built once at import
+_VALID_CATS = frozenset(cat.lower().strip() for cat in CATEGORIES)
+
+# Display names for the LLM that categorized an article / wrote its ELI5 summary
+_CAT_LLM_DISPLAY = {
+    'Hugging Face': 'Hugging Face',
+    'Groq': 'Groq',
+    'OpenAI': 'OpenAI',
+    'ChatLLM': 'ChatLLM (Aitomatic)'
+}
+_ELI5_LLM_DISPLAY = {
+    'ChatLLM': 'ChatLLM (Aitomatic)',
+    'Groq': 'Groq',
+    'HuggingFace': 'Hugging Face',
+    'OpenAI': 'OpenAI',
+    'Simple': 'Eenvoudige extractie'
+}
+
+# HTML sanitization patterns for clean_html_for_display, compiled once at import
+_DANGEROUS_TAGS = r'(script|style|iframe|object|embed|form|input|button)'
+_DANGEROUS_BLOCK_RE = re.compile(rf'<{_DANGEROUS_TAGS}\b[^>]*>.*?</\1>', re.IGNORECASE | re.DOTALL)
+_DANGEROUS_SELF_RE = re.compile(rf'<{_DANGEROUS_TAGS}\b[^>]*/?>', re.IGNORECASE)
+_EVENT_ATTR_RE = re.compile(r'''\s+on\w+=(?:"[^"]*"|'[^']*')''', re.IGNORECASE)
+_MULTI_SPACE_RE = re.compile(r'[ \t]+')
+_MULTI_NL_RE = re.compile(r'\n\s*\n\s*\n+')
 
 # Page configuration
 st.set_page_config(
@@ -36,252 +104,18 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Hide default Streamlit menu and footer
-st.markdown("""
-    <style>
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Horizontal menu */
-    .horizontal-menu {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        gap: 2rem;
-        padding: 1rem 0;
-        border-bottom: 2px solid #e0e0e0;
-        margin-bottom: 2rem;
-        background-color: #ffffff;
-    }
-    
-    .menu-items-container {
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        flex: 1;
-    }
-    
-    .user-indicator {
-        font-size: 0.75rem;
-        color: #888;
-        padding: 0.5rem 1rem;
-        white-space: nowrap;
-        margin-left: auto;
-        text-align: right;
-    }
-    
-    .menu-item {
-        font-size: 1.2rem;
-        font-weight: 500;
-        color: #666;
-        text-decoration: none;
-        padding: 0.5rem 1rem;
-        border-radius: 4px;
-        transition: all 0.2s;
-        cursor: pointer;
-    }
-    
-    .menu-item:hover {
-        background-color: #f0f0f0;
-        color: #1f77b4;
-    }
-    
-    .menu-item.active {
-        color: #1f77b4;
-        border-bottom: 3px solid #1f77b4;
-    }
-    
-    /* Article cards */
-    .article-card {
-        padding: 1rem;
-        margin-bottom: 1.5rem;
-        border: 1px solid #e0e0e0;
-        border-radius: 8px;
-        background-color: #ffffff;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        transition: transform 0.2s, box-shadow 0.2s;
-    }
-    
-    .article-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-    }
-    
-    .article-image {
-        width: 100%;
-        max-height: 200px;
-        object-fit: cover;
-        border-radius: 4px;
-        margin-bottom: 0.75rem;
-    }
-    
-    .article-title {
-        font-size: 1.1rem;
-        font-weight: bold;
-        color: #1f77b4;
-        margin-bottom: 0.5rem;
-        line-height: 1.4;
-    }
-    
-    .article-meta {
-        font-size: 0.85rem;
-        color: #666;
-        margin-bottom: 0.5rem;
-    }
-    
-    .article-summary {
-        font-size: 0.9rem;
-        color: #333;
-        line-height: 1.5;
-        margin: 0.5rem 0;
-    }
-    
-    /* Larger button for article summary - show full text */
-    div[data-testid="stButton"] > button[kind="secondary"] {
-        min-height: 80px;
-        height: auto;
-        white-space: normal;
-        word-wrap: break-word;
-        overflow-wrap: break-word;
-        padding: 1rem 1.25rem;
-        text-align: left;
-        line-height: 1.6;
-        font-size: 0.95rem;
-        display: flex;
-        align-items: flex-start;
-        justify-content: flex-start;
-    }
-    
-    /* Specific styling for summary buttons */
-    button[key^="summary_"] {
-        min-height: 80px !important;
-        height: auto !important;
-        white-space: normal !important;
-        word-wrap: break-word !important;
-        overflow-wrap: break-word !important;
-        text-overflow: unset !important;
-    }
-    
-    .categories-container {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.5rem;
-        margin: 0.5rem 0;
-    }
-    
-    .article-category {
-        display: inline-block;
-        background-color: #e3f2fd;
-        color: #1976d2;
-        padding: 0.4rem 0.8rem;
-        border-radius: 12px;
-        font-size: 0.9rem;
-        white-space: nowrap;
-        margin: 0;
-        word-break: keep-all;
-        overflow-wrap: normal;
-    }
-    
-    .eli5-box {
-        background-color: #f0f7ff;
-        border-left: 4px solid #1f77b4;
-        padding: 1rem;
-        margin: 1rem 0;
-        border-radius: 4px;
-    }
-    
-    .eli5-title {
-        font-weight: bold;
-        color: #1f77b4;
-        margin-bottom: 0.5rem;
-    }
-    
-    .eli5-llm-badge {
-        font-size: 0.75rem;
-        color: #666;
-        font-style: italic;
-        margin-top: 0.5rem;
-    }
-    
-    /* Compact article detail page */
-    .article-detail-container {
-        max-width: 900px;
-        margin: 0 auto;
-    }
-    
-    .article-detail-image {
-        max-width: 50% !important;
-        margin: 0 auto;
-        display: block;
-    }
-    
-    /* Responsive header image with abstract sunrise */
-    .header-image-container {
-        width: 100%;
-        height: 200px;
-        background: linear-gradient(135deg, #ff6b6b 0%, #ffa500 25%, #ffd700 50%, #ff8c00 75%, #ff6347 100%);
-        background-size: cover;
-        background-position: center;
-        margin: 0;
-        padding: 0;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .header-image-container::before {
-        content: '';
-        position: absolute;
-        bottom: 0;
-        left: 0;
-        right: 0;
-        height: 60%;
-        background: linear-gradient(to top, rgba(255, 140, 0, 0.8) 0%, rgba(255, 215, 0, 0.6) 30%, rgba(255, 165, 0, 0.4) 60%, transparent 100%);
-    }
-    
-    .header-image-container::after {
-        content: '';
-        position: absolute;
-        top: 20%;
-        left: 50%;
-        transform: translateX(-50%);
-        width: 120px;
-        height: 120px;
-        background: radial-gradient(circle, rgba(255, 255, 255, 0.9) 0%, rgba(255, 255, 200, 0.7) 40%, transparent 70%);
-        border-radius: 50%;
-        box-shadow: 0 0 60px rgba(255, 255, 200, 0.8);
-    }
-    
-    @media (max-width: 768px) {
-        .horizontal-menu {
-            flex-direction: column;
-            gap: 0.5rem;
-        }
-        .menu-item {
-            text-align: center;
-        }
-        .header-image-container {
-            height: 150px;
-        }
-        .header-image-container::after {
-            width: 80px;
-            height: 80px;
-        }
-    }
-    
-    @media (min-width: 1200px) {
-        .header-image-container {
-            height: 250px;
-        }
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Hide default Streamlit menu and footer; the stylesheet lives in assets/styles.css
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    """Read the app stylesheet once per process instead of re-parsing it every rerun."""
+    return (BASE_DIR / 'assets' / 'styles.css').read_text(encoding='utf-8')
+
+
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 # Initialize session state
 if 'user' not in st.session_state:
     st.session_state.user = None
-if 'supabase' not in st.session_state:
-    st.session_state.supabase = None
 if 'preferences' not in st.session_state:
     st.session_state.preferences = None
 if 'current_page' not in st.session_state:
@@ -317,6 +151,15 @@ def set_cookie(name: str, value: str, days: int = 30):
     st.markdown(js_code, unsafe_allow_html=True)
 
 
+def clear_cookies(names=AUTH_COOKIES):
+    """Delete several cookies with a single script instead of one set_cookie call each."""
+    js_code = "".join(
+        f'document.cookie = "{name}=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;";'
+        for name in names
+    )
+    components.html(f"<script>{js_code}</script>", height=0)
+
+
 def get_cookie(name: str) -> Optional[str]:
     """Get a cookie value using JavaScript and return via query params."""
     cookie_key = f"_cookie_{name}"
@@ -367,20 +210,178 @@ def get_cookie(name: str) -> Optional[str]:
     return None
 
 
+def read_cookies() -> Dict[str, str]:
+    """
+    Snapshot of the browser cookies for this session.
+    
+    Uses st.context.cookies (sent with the page request, no round trip); falls
+    back to the JavaScript get_cookie() bridge on Streamlit versions without it.
+    """
+    cookies = getattr(getattr(st, 'context', None), 'cookies', None)
+    if cookies is not None:
+        return dict(cookies)
+    return {name: value for name in AUTH_COOKIES if (value := get_cookie(name))}
+
+
+def set_auth_cookie(access_token: Optional[str], refresh_token: Optional[str], email: Optional[str], days: int = 30):
+    """Store the login session in one cookie (base64 JSON, safe as a cookie value)."""
+    blob = json.dumps({"at": access_token, "rt": refresh_token, "em": email})
+    set_cookie(AUTH_COOKIE, base64.urlsafe_b64encode(blob.encode()).decode(), days=days)
+
+
+def read_auth_cookie(cookies: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Access token, refresh token and email from the auth cookie, or from the legacy cookies."""
+    blob = {}
+    if cookies.get(AUTH_COOKIE):
+        try:
+            blob = json.loads(base64.urlsafe_b64decode(cookies[AUTH_COOKIE].encode()))
+        except (ValueError, TypeError):
+            blob = {}
+    return {
+        'access_token': blob.get('at') or cookies.get("supabase_access_token"),
+        'refresh_token': blob.get('rt') or cookies.get("supabase_refresh_token"),
+        'email': blob.get('em') or cookies.get("user_email"),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _storage_backend(use_supabase: bool):
+    """Create the storage backend once per process; keyed on whether Supabase is configured."""
+    return get_supabase_client()
+
+
+def get_supabase():
+    """Supabase client (or local storage fallback), shared across reruns and sessions."""
+    return _storage_backend(bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_ANON_KEY')))
+
+
 def init_supabase():
-    """Initialize Supabase client or local storage."""
+    """Return the shared Supabase client or local storage, showing an error if it can't be created."""
     try:
-        if st.session_state.supabase is None:
-            st.session_state.supabase = get_supabase_client()
-            
-            # Supabase is initialized (or local storage fallback)
-        
-        return st.session_state.supabase
+        return get_supabase()
     except Exception as e:
         st.error(f"Error initializing storage: {str(e)}")
         return None
 
 
+@st.cache_data(ttl=120, show_spinner=False)
+def get_prefs(user_id: str) -> Dict[str, Any]:
+    """Fetch user preferences, cached per user id. Call invalidate_user_preferences() after changes."""
+    return get_supabase().get_user_preferences(user_id)
+
+
+def load_user_preferences() -> Optional[Dict[str, Any]]:
+    """
+    Load preferences of the logged-in user into session state.
+    
+    Always goes through get_prefs, so changes made elsewhere (another session,
+    the database) show up within its TTL instead of only after a new session.
+    """
+    user_id = current_user_id()
+    st.session_state.preferences = get_prefs(user_id) if user_id else None
+    return st.session_state.preferences
+
+
+def invalidate_user_preferences():
+    """Drop cached preferences after they changed, so the next load reads them again."""
+    st.session_state.preferences = None
+    get_prefs.clear()
+
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def _fetch_articles(categories: tuple = (), blacklist_keywords: tuple = (), limit: int = 50) -> List[Dict[str, Any]]:
+    """Fetch articles with a short TTL cache so reruns don't hit the database."""
+    return get_supabase().get_articles(
+        limit=limit,
+        categories=list(categories) or None,
+        blacklist_keywords=list(blacklist_keywords) or None
+    )
+
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def _fetch_filtered_out_articles(categories: tuple = (), blacklist_keywords: tuple = (), limit: int = 200) -> List[Dict[str, Any]]:
+    """Fetch articles hidden by the given filters (filtered in the database), with a short TTL cache."""
+    return get_supabase().get_filtered_out_articles(
+        blacklist_keywords=list(blacklist_keywords),
+        selected_categories=list(categories),
+        limit=limit
+    )
+
+
+@st.cache_data(ttl=60, max_entries=64, show_spinner=False)
+def _fetch_articles_page(categories: tuple = (), blacklist_keywords: tuple = (),
+                         cursor: Optional[tuple] = None, limit: int = ARTICLES_PAGE_SIZE):
+    """Fetch one cursor page of articles, with a short TTL cache. Returns (articles, next_cursor)."""
+    return get_supabase().get_articles_page(
+        limit=limit,
+        cursor=cursor,
+        categories=list(categories) or None,
+        blacklist_keywords=list(blacklist_keywords) or None
+    )
+
+
+@st.cache_data(ttl=300, max_entries=512, show_spinner=False)
+def _fetch_article(article_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a single article for the detail page, cached so reruns don't hit the database."""
+    return get_supabase().get_article_by_id(article_id)
+
+
+def verify_access_token(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Verify a Supabase access token locally with SUPABASE_JWT_SECRET.
+    
+    Returns the token claims, or None if the token is invalid, expires within a
+    minute, or can't be checked locally (PyJWT missing or no secret configured).
+    """
+    secret = os.getenv('SUPABASE_JWT_SECRET')
+    if not token or not secret or jwt is None:
+        return None
+    try:
+        claims = jwt.decode(token, secret, algorithms=["HS256"], audience="authenticated")
+    except jwt.InvalidTokenError:
+        return None
+    if claims.get('exp', 0) - time.time() < 60:
+        return None
+    return claims
+
+
+def user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the session-state user dict from verified token claims."""
+    return {
+        'id': claims.get('sub'),
+        'email': claims.get('email'),
+        'created_at': None
+    }
+
+
+def is_allowed_email(email: Optional[str]) -> bool:
+    """True for a non-empty email that may be logged in or restored (not a mock account)."""
+    return bool(email) and email.lower() not in BLOCKED_EMAILS
+
+
+def session_user_dict(user) -> Dict[str, Any]:
+    """
+    Convert a Supabase user object (or dict) to the dict format kept in session state.
+    
+    Normalizing once at login means page code can read the session user with plain dict lookups.
+    """
+    return {
+        'id': get_user_attr(user, 'id'),
+        'email': get_user_attr(user, 'email'),
+        'created_at': get_user_attr(user, 'created_at')
+    }
+
+
+def current_user_id() -> Optional[str]:
+    """ID of the logged-in user (session state always holds a normalized dict)."""
+    return (st.session_state.user or {}).get('id')
+
+
+def current_user_email(default: Optional[str] = None) -> Optional[str]:
+    """Email of the logged-in user, or `default` when nobody is logged in."""
+    return (st.session_state.user or {}).get('email') or default
+
+
 def get_user_attr(user, attr: str, default=None):
     """Safely get user attribute from dict or Pydantic object."""
     if user is None:
@@ -403,150 +404,128 @@ def get_user_attr(user, attr: str, default=None):
     return default
 
 
+MENU_PAGES = [
+    ("Nieuws", "Nieuws"),
+    ("Waarom", "Waarom?"),
+    ("Frustrate", "Dit wil je niet"),
+    ("Gebruiker", "Gebruiker"),
+]
+MENU_PAGE_KEYS = frozenset(page_key for page_key, _ in MENU_PAGES)
+_MENU_DIVIDER_HTML = '<div class="horizontal-menu"></div>'
+
+
 def render_horizontal_menu():
     """Render horizontal navigation menu."""
-    # Get user email for display
-    user_email = "geen"
-    if st.session_state.user:
-        user_email = get_user_attr(st.session_state.user, 'email', 'geen')
-    
-    menu_html = f"""
-    <div class="horizontal-menu">
-        <div class="menu-items-container">
-        <a class="menu-item" href="?page=Nieuws" onclick="window.location.href='?page=Nieuws'; return false;" target="_self">Nieuws</a>
-        <a class="menu-item" href="?page=Waarom" onclick="window.location.href='?page=Waarom'; return false;" target="_self">Waarom?</a>
-            <a class="menu-item" href="?page=Frustrate" onclick="window.location.href='?page=Frustrate'; return false;" target="_self">Dit wil je niet</a>
-        <a class="menu-item" href="?page=Gebruiker" onclick="window.location.href='?page=Gebruiker'; return false;" target="_self">Gebruiker</a>
-        </div>
-        <div class="user-indicator">Ingelogde gebruiker: {user_email}</div>
-    </div>
-    """
-    st.markdown(menu_html, unsafe_allow_html=True)
+    # Only the user indicator is dynamic; the rest of the menu markup is static
+    user_indicator_html = f'<div class="user-indicator">Ingelogde gebruiker: {escape(current_user_email("geen"))}</div>'
     
-    # Update current page from query params
-    page = st.query_params.get("page", "Nieuws")
-    if page in ["Nieuws", "Waarom", "Frustrate", "Gebruiker"]:
+    # Support direct links like ?page=Gebruiker on first load
+    page = st.query_params.get("page")
+    if page in MENU_PAGE_KEYS and '_menu_page_synced' not in st.session_state:
         st.session_state.current_page = page
+    st.session_state['_menu_page_synced'] = True
+    
+    # Buttons switch pages in-place (partial rerun) instead of reloading the whole page
+    cols = st.columns([1] * len(MENU_PAGES) + [2])
+    for col, (page_key, label) in zip(cols, MENU_PAGES):
+        is_active = st.session_state.current_page == page_key
+        if col.button(label, key=f"menu_{page_key}", use_container_width=True,
+                      type="primary" if is_active else "secondary"):
+            st.session_state.current_page = page_key
+            if "article" in st.query_params:
+                del st.query_params["article"]
+            if "page" in st.query_params:
+                del st.query_params["page"]
+            st.rerun()
+    cols[-1].markdown(user_indicator_html, unsafe_allow_html=True)
+    st.markdown(_MENU_DIVIDER_HTML, unsafe_allow_html=True)
 
 
-def strip_html_tags(text: str) -> str:
-    """Remove HTML tags from text (for summary extraction)."""
-    if not text:
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = unescape(text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-
+@lru_cache(maxsize=512)
 def clean_html_for_display(text: str) -> str:
-    """Clean HTML but preserve formatting tags like <p>, <br>, <strong>, <em>."""
+    """Clean HTML but preserve formatting tags like <p>, <br>, <strong>, <em> (memoized per input text)."""
     if not text:
         return ""
     
-    # Unescape HTML entities
-    text = unescape(text)
-    
-    # Remove dangerous/script tags but keep formatting tags
-    # Keep: p, br, strong, em, b, i, u, h1-h6, ul, ol, li, blockquote, a
-    # Remove: script, style, iframe, object, embed, form, input, button
-    dangerous_tags = ['script', 'style', 'iframe', 'object', 'embed', 'form', 'input', 'button', 'onclick', 'onerror']
-    
-    for tag in dangerous_tags:
-        # Remove opening and closing tags
-        text = re.sub(rf'<{tag}[^>]*>.*?</{tag}>', '', text, flags=re.IGNORECASE | re.DOTALL)
-        # Remove self-closing tags
-        text = re.sub(rf'<{tag}[^>]*/?>', '', text, flags=re.IGNORECASE)
-    
-    # Remove onclick and other event handlers from remaining tags
-    text = re.sub(r'\s+on\w+="[^"]*"', '', text, flags=re.IGNORECASE)
-    text = re.sub(r"\s+on\w+='[^']*'", '', text, flags=re.IGNORECASE)
+    # Plain text has no entities or tags, so only the whitespace cleanup applies
+    if '<' in text or '&' in text:
+        # Unescape HTML entities
+        text = unescape(text)
+        
+        # Remove dangerous/script tags but keep formatting tags
+        # Keep: p, br, strong, em, b, i, u, h1-h6, ul, ol, li, blockquote, a
+        # Remove: script, style, iframe, object, embed, form, input, button
+        text = _DANGEROUS_BLOCK_RE.sub('', text)
+        text = _DANGEROUS_SELF_RE.sub('', text)
+        
+        # Remove onclick and other event handlers from remaining tags
+        text = _EVENT_ATTR_RE.sub('', text)
     
     # Clean up multiple spaces but preserve line breaks from <br> and <p>
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = _MULTI_NL_RE.sub('\n\n', text)
     
     return text.strip()
 
 
+def split_content_preview(text: str, limit: int = CONTENT_PREVIEW_CHARS) -> tuple:
+    """
+    Split long article content into (preview, rest) at a paragraph boundary.
+    
+    Cuts after the last </p>, blank line or space before `limit` so no tag is split.
+    Returns (text, "") when the text is short enough to show at once.
+    """
+    if len(text) <= limit:
+        return text, ""
+    cut = text.rfind('</p>', 0, limit)
+    if cut != -1:
+        cut += len('</p>')
+    else:
+        cut = text.rfind('\n\n', 0, limit)
+        if cut == -1:
+            cut = text.rfind(' ', 0, limit)
+    if cut <= 0:
+        cut = limit
+    return text[:cut], text[cut:].lstrip()
+
+
+@lru_cache(maxsize=4096)
 def format_datetime(dt_str: Optional[str]) -> str:
-    """Format datetime string for display."""
+    """Format datetime string for display (memoized: the same timestamps recur on every rerun)."""
     if not dt_str:
         return ""
     try:
-        from dateutil import parser
-        dt = parser.parse(dt_str)
-        amsterdam_tz = pytz.timezone('Europe/Amsterdam')
+        try:
+            # Postgres timestamps are ISO-8601; fromisoformat is much cheaper than dateutil
+            dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+        except ValueError:
+            dt = dateutil_parser.parse(dt_str)
         if dt.tzinfo is None:
-            dt = pytz.utc.localize(dt)
-        dt = dt.astimezone(amsterdam_tz)
+            dt = dt.replace(tzinfo=pytz.utc)
+        dt = dt.astimezone(AMSTERDAM_TZ)
         return dt.strftime('%d %B %Y, %H:%M')
     except Exception:
         return dt_str
 
 
-def get_summary_sentences(text: str, num_sentences: int = 3) -> str:
-    """Extract first N complete sentences from text."""
-    if not text:
-        return ""
-    text = strip_html_tags(text)
-    
-    # Better sentence splitting - handle multiple sentence endings
-    # Split on sentence endings followed by space and capital letter or end of string
-    sentences = re.split(r'([.!?]+)\s+(?=[A-Z]|$)', text)
-    
-    # Reconstruct sentences with their punctuation
-    complete_sentences = []
-    i = 0
-    while i < len(sentences):
-        if i + 1 < len(sentences) and re.match(r'[.!?]+', sentences[i + 1]):
-            # This is a sentence with punctuation
-            sentence = (sentences[i] + sentences[i + 1]).strip()
-            if sentence:
-                complete_sentences.append(sentence)
-            i += 2
-        else:
-            # Last part or no punctuation found
-            if sentences[i].strip():
-                complete_sentences.append(sentences[i].strip())
-            i += 1
-    
-    # If regex splitting didn't work well, try simpler approach
-    if len(complete_sentences) < num_sentences:
-        # Fallback: split on sentence endings
-        sentences = re.split(r'([.!?]+)\s+', text)
-        complete_sentences = []
-        for i in range(0, len(sentences) - 1, 2):
-            if i + 1 < len(sentences):
-                sentence = (sentences[i] + sentences[i + 1]).strip()
-                if sentence:
-                    complete_sentences.append(sentence)
-        if len(sentences) % 2 == 1 and sentences[-1].strip():
-            complete_sentences.append(sentences[-1].strip())
-    
-    # Take first N sentences and join them
-    if len(complete_sentences) >= num_sentences:
-        summary = ' '.join(complete_sentences[:num_sentences])
-        # Ensure it ends with punctuation
-        if summary and not summary[-1] in '.!?':
-            summary += '.'
-        return summary
-    elif complete_sentences:
-        # Return all available sentences
-        summary = ' '.join(complete_sentences)
-        if summary and not summary[-1] in '.!?':
-            summary += '.'
-        return summary
-    else:
-        # Fallback: return first part of text (up to reasonable length)
-        text_clean = text.strip()
-        if len(text_clean) > 300:
-            # Try to find a sentence ending within first 300 chars
-            match = re.search(r'[.!?]+\s+', text_clean[:300])
-            if match:
-                return text_clean[:match.end()].strip()
-            return text_clean[:300].strip() + '...'
-        return text_clean
+@lru_cache(maxsize=2048)
+def _parse_categories(raw: str) -> tuple:
+    """Parse categories stored as a string (JSON or bracketed list); each raw string is parsed once."""
+    try:
+        categories = json.loads(raw)
+    except ValueError:
+        # If it's a string but not JSON, try to parse it manually
+        if raw.strip().startswith('['):
+            # Remove brackets and split by comma
+            return tuple(c.strip().strip('"\'') for c in raw.strip('[]').split(',') if c.strip())
+        return ()
+    return tuple(categories) if isinstance(categories, list) else ()
+
+
+@lru_cache(maxsize=32)
+def _normalized_category_set(categories: tuple) -> frozenset:
+    """Lowercased category names as a set; cached because it is rebuilt per article otherwise."""
+    return frozenset(cat.lower().strip() for cat in categories if cat)
 
 
 def article_matches_category_filter(article: Dict[str, Any], selected_categories: List[str]) -> bool:
@@ -569,119 +548,287 @@ def article_matches_category_filter(article: Dict[str, Any], selected_categories
         # No categories selected = show all articles (no filter)
         return True
     
-    # Collect all categories from the article
-    # Only use valid categories from the CATEGORIES list
-    from categorization_engine import CATEGORIES
-    valid_categories = [cat.lower().strip() for cat in CATEGORIES]
-    
-    article_categories = []
+    # Collect the article's categories (single field + array), lowercased,
+    # keeping only valid categories from the CATEGORIES list
+    article_categories = set()
+    article_category = article.get('category')
+    if article_category:
+        article_categories.add(article_category.lower().strip())
+    for cat in article.get('categories') or []:
+        if cat:
+            article_categories.add(cat.lower().strip())
+    article_categories &= _VALID_CATS
     
-    # Add single category field if present AND it's a valid category
-    article_category = article.get('category', '')
-    if article_category and article_category.lower().strip() in valid_categories:
-        article_categories.append(article_category)
+    # If article has no categories, include it (no filter applies)
+    # Otherwise ALL article categories must be selected (case-insensitive)
+    return article_categories <= _normalized_category_set(tuple(selected_categories))
+
+
+@st.cache_resource
+def _eli5_executor() -> ThreadPoolExecutor:
+    """Worker pool shared by all sessions for on-demand ELI5 generation (keeps LLM calls off the script thread)."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="eli5")
+
+
+def start_eli5_generation(article: Dict[str, Any]):
+    """Start generating an ELI5 summary in the background; ensure_eli5_summary picks up the result."""
+    jobs = st.session_state.setdefault('eli5_jobs', {})
+    if article['id'] in jobs:
+        return
+    st.session_state.setdefault('eli5_failed', set()).discard(article['id'])
+    text = f"{article.get('title', '')} {article.get('description', '')}"
+    if article.get('full_content'):
+        text += f" {article.get('full_content', '')[:1000]}"
+    jobs[article['id']] = _eli5_executor().submit(generate_eli5_summary_nl_with_llm, text, article.get('title', ''))
+
+
+def eli5_generation_pending(article_id) -> bool:
+    """True while a background ELI5 generation for this article is still running."""
+    job = st.session_state.get('eli5_jobs', {}).get(article_id)
+    return job is not None and not job.done()
+
+
+def eli5_generation_failed(article_id) -> bool:
+    """True if the last on-demand ELI5 generation for this article returned nothing."""
+    return article_id in st.session_state.get('eli5_failed', set())
+
+
+@st.fragment(run_every=1)
+def render_eli5_progress(article_id):
+    """
+    Status shown while an ELI5 summary is generated on a worker thread.
     
-    # Add categories from array if present (only valid ones)
-    article_categories_array = article.get('categories', []) or []
-    if article_categories_array:
-        for cat in article_categories_array:
-            if cat and cat.lower().strip() in valid_categories:
-                article_categories.append(cat)
+    Nested in the render_article_detail fragment. Reruns on its own every second
+    without holding the script thread; once the job is done it reruns the app so
+    the article page shows the result.
+    """
+    if not eli5_generation_pending(article_id):
+        st.rerun()
+    st.info("⏳ Eenvoudige uitleg wordt gegenereerd...")
+
+
+def compute_daily_stats(articles: List[Dict[str, Any]], selected_categories: List[str],
+                        blacklist: List[str], days: int = 7) -> List[Dict[str, Any]]:
+    """
+    Count included/excluded articles per day (Amsterdam time) for the last `days` days.
     
-    # Remove duplicates and empty values
-    article_categories = [cat for cat in article_categories if cat]
-    article_categories = list(set(article_categories))  # Remove duplicates
+    Date parsing, blacklist matching and grouping run vectorized in pandas.
     
-    # If article has no categories, include it (no filter applies)
-    if not article_categories:
-        return True
+    Returns:
+        List of dicts with 'date', 'included', 'excluded' and 'total', newest day first
+    """
+    if not articles:
+        return []
+    
+    df = pd.DataFrame(articles)
+    if 'published_at' not in df:
+        return []
+    
+    # Naive timestamps are treated as UTC
+    published = pd.to_datetime(df['published_at'], utc=True, errors='coerce', format='ISO8601')
+    published = published.dt.tz_convert(AMSTERDAM_TZ)
+    cutoff = pd.Timestamp.now(tz=AMSTERDAM_TZ) - pd.Timedelta(days=days)
+    recent = published >= cutoff  # NaT compares False
+    if not recent.any():
+        return []
+    
+    included = pd.Series(True, index=df.index)
+    
+    # Category filter: article is excluded if ANY category is NOT in selected_categories
+    if selected_categories:
+        included &= pd.Series(
+            [article_matches_category_filter(article, selected_categories) for article in articles],
+            index=df.index
+        )
     
-    # Check if ALL article categories are in selected_categories
-    # If ANY category is NOT in selected_categories, filter it out
-    # Case-insensitive comparison to handle variations
-    selected_lower = [cat.lower().strip() for cat in selected_categories if cat]
-    for cat in article_categories:
-        if cat and cat.lower().strip() not in selected_lower:
-            return False  # This category is not selected, so filter out
+    # Blacklist filter over title, description and full_content
+    blacklist_pattern = compile_blacklist(blacklist)
+    if blacklist_pattern is not None:
+        empty = pd.Series('', index=df.index)
+        text = (
+            df.get('title', empty).fillna('') + ' ' +
+            df.get('description', empty).fillna('') + ' ' +
+            df.get('full_content', empty).fillna('')
+        ).str.lower()
+        included &= ~text.str.contains(blacklist_pattern, regex=True)
+    
+    daily = (
+        pd.DataFrame({'day': published.dt.strftime('%Y-%m-%d'), 'included': included})[recent]
+        .groupby('day')['included']
+        .agg(['sum', 'count'])
+        .sort_index(ascending=False)
+    )
+    
+    return [
+        {
+            'date': date.fromisoformat(day).strftime('%d %B %Y'),
+            'included': int(row['sum']),
+            'excluded': int(row['count'] - row['sum']),
+            'total': int(row['count'])
+        }
+        for day, row in daily.iterrows()
+    ]
+
+
+def get_daily_stats(supabase, selected_categories: List[str], blacklist: List[str], days: int = 7) -> List[Dict[str, Any]]:
+    """
+    Included/excluded article counts per day.
     
-    # All categories are in selected_categories
-    return True
+    Uses the server-side stats_last_7_days RPC on Supabase (one row per day) and
+    falls back to computing from recent articles for local storage or when the
+    RPC is not available.
+    """
+    rows = None
+    if isinstance(supabase, SupabaseClient):
+        rows = supabase.get_daily_stats(blacklist, selected_categories, days=days)
+    
+    if rows is None:
+        return compute_daily_stats(_fetch_articles(limit=500), selected_categories, blacklist, days=days)
+    
+    return [
+        {
+            'date': date.fromisoformat(str(row['day'])).strftime('%d %B %Y'),
+            'included': row['included'],
+            'excluded': row['excluded'],
+            'total': row['included'] + row['excluded']
+        }
+        for row in rows
+    ]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_daily_stats(categories: tuple, blacklist: tuple, today_iso: str, days: int = 7) -> List[Dict[str, Any]]:
+    """get_daily_stats() cached per filter set; today_iso makes the cache roll over at midnight."""
+    return get_daily_stats(get_supabase(), list(categories), list(blacklist), days=days)
 
 
-def ensure_eli5_summary(article: Dict[str, Any], supabase, generate_if_missing: bool = False) -> Dict[str, Any]:
+def clear_article_caches():
+    """Drop all cached article data (lists, detail pages and statistics) and go back to the first page."""
+    _fetch_articles.clear()
+    _fetch_articles_page.clear()
+    _fetch_filtered_out_articles.clear()
+    _fetch_article.clear()
+    _cached_daily_stats.clear()
+    st.session_state.article_pages = 1
+
+
+def ensure_eli5_summary(article: Dict[str, Any], supabase) -> Dict[str, Any]:
     """
     Ensure article has ELI5 summary.
     
+    Uses the stored summary, or the result of a finished background generation
+    (see start_eli5_generation), which is then saved to the database.
+    Never calls the LLM itself.
+    
     Args:
         article: Article dict
         supabase: Supabase client
-        generate_if_missing: If True, generate summary synchronously (can freeze page). 
-                            If False, only return existing summary (default).
     """
-    if not article.get('eli5_summary_nl'):
-        if generate_if_missing:
-            # Generate ELI5 summary (can take 30+ seconds - use with caution)
-            with st.spinner("Eenvoudige uitleg genereren..."):
-                text = f"{article.get('title', '')} {article.get('description', '')}"
-                if article.get('full_content'):
-                    text += f" {article.get('full_content', '')[:1000]}"
-                
-                result = generate_eli5_summary_nl_with_llm(text, article.get('title', ''))
-                if result and result.get('summary'):
-                    article['eli5_summary_nl'] = result['summary']
-                    article['eli5_llm'] = result.get('llm', 'Onbekend')
-                    # Save to database
-                    supabase.update_article_eli5(article['id'], result['summary'], result.get('llm'))
-                else:
-                    article['eli5_summary_nl'] = None
-                    article['eli5_llm'] = None
-            # Don't generate, just return existing or None
-            article['eli5_summary_nl'] = None
-            article['eli5_llm'] = None
-    else:
+    if article.get('eli5_summary_nl'):
         # Get LLM info if available
-        article['eli5_llm'] = article.get('eli5_llm', 'Onbekend')
+        article['eli5_llm'] = article.get('eli5_llm') or 'Onbekend'
+        return article
+    
+    article['eli5_summary_nl'] = None
+    article['eli5_llm'] = None
+    
+    jobs = st.session_state.get('eli5_jobs', {})
+    job = jobs.get(article['id'])
+    if job is not None and job.done():
+        del jobs[article['id']]
+        try:
+            result = job.result()
+        except Exception as e:
+            print(f"ELI5 generation failed for article {article['id']}: {e}")
+            result = None
+        if result and result.get('summary'):
+            article['eli5_summary_nl'] = result['summary']
+            article['eli5_llm'] = result.get('llm', 'Onbekend')
+            # Save to database
+            if supabase.update_article_eli5(article['id'], result['summary'], result.get('llm')):
+                _fetch_article.clear()
+        else:
+            st.session_state.setdefault('eli5_failed', set()).add(article['id'])
     
     return article
 
 
-def render_article_card(article: Dict[str, Any], supabase):
-    """Render a single article card (overview - only image and summary)."""
-    article_id = article['id']
-    
-    # Create a container for the clickable card
-    with st.container():
-        # Image
-        if article.get('image_url'):
-            try:
-                st.image(article['image_url'], use_container_width=True)
-            except:
-                pass
-    
-        # Title (clickable - this is the main way to open article)
-        title = article.get('title', 'Geen titel')
-        title_display = title[:70] + "..." if len(title) > 70 else title
-        if st.button(title_display, key=f"article_{article_id}", use_container_width=True):
-            st.query_params["article"] = article_id
-            st.rerun()
+@lru_cache(maxsize=512)
+def _fallback_card_summary(full_content: str) -> str:
+    """Card summary for articles stored before summary_plain existed; memoized across reruns."""
+    return get_summary_sentences(full_content, num_sentences=3)
+
+
+@lru_cache(maxsize=64)
+def image_src(image_url: str) -> Optional[str]:
+    """
+    Value for an <img src> of an article image, or None if it can't be shown.
     
-        # Summary from article content (first sentences) - clickable
-        full_content = article.get('full_content', '')
-        if full_content:
-            # Get first 3-4 complete sentences from the article content
-            summary = get_summary_sentences(full_content, num_sentences=3)
-            if summary:
-                # Make the summary clickable - show full text without truncation
-                # Use a button with proper styling to show complete sentences
-                if st.button(summary, key=f"summary_{article_id}", use_container_width=True):
-                    st.query_params["article"] = article_id
-                    st.rerun()
+    Remote URLs are used as-is (protocol-relative //host URLs get https:);
+    local image files, which st.image used to serve, are inlined as a data URI.
+    """
+    if image_url.startswith(('http://', 'https://')):
+        return image_url
+    if image_url.startswith('//'):
+        return f"https:{image_url}"
+    try:
+        path = Path(image_url)
+        mime = mimetypes.guess_type(path.name)[0]
+        if mime and mime.startswith('image/') and path.is_file():
+            return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode()}"
+    except (OSError, ValueError):
+        pass
+    return None
+
 
+def article_card_html(article: Dict[str, Any], page: str = "Nieuws") -> str:
+    """Build the HTML for a single article card (overview - image, title and summary)."""
+    link = f"?page={escape(page)}&amp;article={escape(str(article['id']))}"
+    parts = [f'<a class="article-card" href="{link}" target="_self">']
+    
+    # Image (the browser lazy-loads remote images)
+    src = image_src(article['image_url']) if article.get('image_url') else None
+    if src:
+        parts.append(f'<img src="{escape(src)}" loading="lazy" decoding="async" class="article-image">')
+    
+    # Title (clickable - this is the main way to open article)
+    title = article.get('title', 'Geen titel')
+    title_display = f"{title[:70]}..." if len(title) > 70 else title
+    parts.append(f'<div class="article-title">{escape(title_display)}</div>')
+    
+    # Summary from article content (first sentences)
+    full_content = article.get('full_content', '')
+    if full_content:
+        # Use the summary precomputed at ingest; fall back for older articles
+        summary = article.get('summary_plain') or _fallback_card_summary(full_content)
+        if summary:
+            parts.append(f'<div class="article-summary">{escape(summary)}</div>')
+    
+    parts.append('</a>')
+    return ''.join(parts)
+
+
+def render_article_grid(articles: List[Dict[str, Any]], num_cols: int = 4):
+    """Render all article cards as a single HTML grid instead of one widget tree per card."""
+    page = st.session_state.current_page
+    cards_html = ''.join(article_card_html(article, page) for article in articles)
+    st.markdown(
+        f'<div class="article-grid" style="grid-template-columns: repeat({num_cols}, minmax(0, 1fr));">{cards_html}</div>',
+        unsafe_allow_html=True
+    )
 
+
+@st.fragment
 def render_article_detail(article_id: str):
-    """Render full article detail page."""
-    supabase = st.session_state.supabase
-    article = supabase.get_article_by_id(article_id)
+    """
+    Render full article detail page.
+    
+    Runs as a fragment: starting an ELI5 generation reruns only this page body,
+    and while it runs only the nested render_eli5_progress fragment reruns
+    (once per second). Navigating back calls st.rerun() with the default app scope.
+    """
+    supabase = get_supabase()
+    article = _fetch_article(article_id)
     
     if not article:
         st.error("Artikel niet gevonden")
@@ -691,8 +838,8 @@ def render_article_detail(article_id: str):
         return
     
     # Don't generate ELI5 automatically (prevents freezing)
-    # Only use existing summary if available
-    article = ensure_eli5_summary(article, supabase, generate_if_missing=False)
+    # Only use existing summary (or a finished on-demand generation); the background scheduler fills in missing ones
+    article = ensure_eli5_summary(article, supabase)
     
     st.markdown('<div class="article-detail-container">', unsafe_allow_html=True)
     
@@ -710,68 +857,43 @@ def render_article_detail(article_id: str):
     
     st.markdown("---")
     
-    # Layout: Image on left, Categorization info on right
-    col_img, col_cat = st.columns([1, 1])
+    # Layout: Image on left, Categorization info on right (one HTML flex block, no st.columns)
+    parts = ['<div class="article-detail-wrap">']
     
-    with col_img:
-        # Image on the left
-        if article.get('image_url'):
-            try:
-                st.image(article['image_url'], use_container_width=True)
-            except:
-                pass
+    src = image_src(article['image_url']) if article.get('image_url') else None
+    if src:
+        parts.append(f'<div class="col-img"><img src="{escape(src)}" alt="" decoding="async"></div>')
     
-    with col_cat:
-        # Categorization information on the right
-        categories = article.get('categories', [])
-        
-        # Handle categories if they're stored as a string (JSON) or list
-        if isinstance(categories, str):
-            try:
-                import json
-                categories = json.loads(categories)
-            except:
-                # If it's a string but not JSON, try to parse it manually
-                if categories.strip().startswith('['):
-                    # Remove brackets and split by comma
-                    categories = [c.strip().strip('"\'') for c in categories.strip('[]').split(',') if c.strip()]
-                else:
-                    categories = []
-        
-        # Ensure categories is a list
-        if not isinstance(categories, list):
-            categories = []
+    # Categorization information on the right
+    categories = article.get('categories', [])
+    
+    # Handle categories if they're stored as a string (JSON) or list
+    if isinstance(categories, str):
+        categories = list(_parse_categories(categories))
+    
+    # Ensure categories is a list
+    if not isinstance(categories, list):
+        categories = []
+    
+    parts.append('<div class="col-meta"><h3>Categorieën</h3>')
+    # Use proper HTML escaping for category names; skip empty ones
+    categories_html = ''.join(f'<span class="article-category">{escape(str(cat))}</span>' for cat in categories if cat)
+    if categories_html:
+        parts.append(f'<div class="categories-container">{categories_html}</div>')
         
-        if categories and len(categories) > 0:
-            st.subheader("Categorieën")
-            # Display categories in a horizontal flex container
-            # Use proper HTML escaping for category names
-            from html import escape
-            categories_html = '<div class="categories-container">'
-            for cat in categories:
-                if cat:  # Only add non-empty categories
-                    escaped_cat = escape(str(cat))
-                    categories_html += f'<span class="article-category">{escaped_cat}</span>'
-            categories_html += '</div>'
-            st.markdown(categories_html, unsafe_allow_html=True)
-            
-            # Show which LLM was used for categorization
-            categorization_llm = article.get('categorization_llm', 'Keywords')
-            if categorization_llm and categorization_llm != 'Keywords':
-                llm_display = {
-                    'Hugging Face': 'Hugging Face',
-                    'Groq': 'Groq',
-                    'OpenAI': 'OpenAI',
-                    'ChatLLM': 'ChatLLM (Aitomatic)'
-                }.get(categorization_llm, categorization_llm)
-                st.caption(f"📊 Categorisatie door: {llm_display}")
-            else:
-                st.caption("📊 Categorisatie door: Keywords (geen LLM)")
+        # Show which LLM was used for categorization
+        categorization_llm = article.get('categorization_llm', 'Keywords')
+        if categorization_llm and categorization_llm != 'Keywords':
+            llm_display = _CAT_LLM_DISPLAY.get(categorization_llm, categorization_llm)
+            parts.append(f'<p class="detail-caption">📊 Categorisatie door: {escape(llm_display)}</p>')
         else:
-            st.subheader("Categorieën")
-            st.info("Geen categorieën beschikbaar")
-        
-        st.markdown("---")
+            parts.append('<p class="detail-caption">📊 Categorisatie door: Keywords (geen LLM)</p>')
+    else:
+        parts.append('<p class="detail-info">Geen categorieën beschikbaar</p>')
+    parts.append('</div></div>')
+    st.markdown(''.join(parts), unsafe_allow_html=True)
+    
+    st.markdown("---")
     
     # Description
     if article.get('description'):
@@ -781,22 +903,11 @@ def render_article_detail(article_id: str):
         st.markdown("---")
     
     # ELI5 Summary (show existing or allow generation on demand)
-    # Check if we need to generate
-    if not article.get('eli5_summary_nl'):
-        # Show button to generate ELI5 summary (prevents freezing)
-        if st.button("✨ Genereer eenvoudige uitleg (ELI5)", key=f"generate_eli5_{article.get('id', article_id)}"):
-            article = ensure_eli5_summary(article, supabase, generate_if_missing=True)
-            st.rerun()
-    
-    if article.get('eli5_summary_nl'):
+    if not article.get('eli5_summary_nl') and eli5_generation_pending(article['id']):
+        render_eli5_progress(article['id'])
+    elif article.get('eli5_summary_nl'):
         llm_name = article.get('eli5_llm', 'Onbekend')
-        llm_display = {
-            'ChatLLM': 'ChatLLM (Aitomatic)',
-            'Groq': 'Groq',
-            'HuggingFace': 'Hugging Face',
-            'OpenAI': 'OpenAI',
-            'Simple': 'Eenvoudige extractie'
-        }.get(llm_name, llm_name)
+        llm_display = _ELI5_LLM_DISPLAY.get(llm_name, llm_name)
         
         st.markdown(f"""
         <div class="eli5-box">
@@ -805,17 +916,28 @@ def render_article_detail(article_id: str):
             <div class="eli5-llm-badge">Gegenereerd met: {llm_display}</div>
         </div>
         """, unsafe_allow_html=True)
-        st.markdown("---")
     else:
-        # Show message if ELI5 generation failed
-        st.info("⚠️ Eenvoudige uitleg kon niet worden gegenereerd. Probeer het later opnieuw.")
-        st.markdown("---")
+        # Usually generated by the background scheduler; offer it on demand until then
+        st.caption("Eenvoudige uitleg wordt binnenkort automatisch gegenereerd.")
+        if st.button("✨ Genereer eenvoudige uitleg (ELI5)", key=f"generate_eli5_{article.get('id', article_id)}"):
+            # The LLM call runs on a worker thread; render_eli5_progress polls for the result
+            start_eli5_generation(article)
+            st.rerun(scope="fragment")
+        # Only after an on-demand attempt actually returned nothing
+        if eli5_generation_failed(article['id']):
+            st.info("⚠️ Eenvoudige uitleg kon niet worden gegenereerd. Probeer het later opnieuw.")
+    st.markdown("---")
     
     # Full content
     if article.get('full_content'):
         st.subheader("Volledige inhoud")
         clean_content = clean_html_for_display(article['full_content'])
-        st.markdown(clean_content, unsafe_allow_html=True)
+        # Long articles: show a preview and keep the rest in a collapsed expander
+        preview, rest = split_content_preview(clean_content)
+        st.markdown(preview, unsafe_allow_html=True)
+        if rest:
+            with st.expander("Toon volledige inhoud"):
+                st.markdown(rest, unsafe_allow_html=True)
     
     # Source link
     st.markdown("---")
@@ -827,9 +949,6 @@ def render_article_detail(article_id: str):
 
 def check_and_fetch_new_articles():
     """Check if 15 minutes have passed since last fetch and fetch new articles if needed."""
-    import time
-    from datetime import datetime, timedelta
-    
     # Check if we're already fetching to avoid duplicate fetches
     if st.session_state.is_fetching:
         return
@@ -855,30 +974,23 @@ def check_and_fetch_new_articles():
             'https://feeds.nos.nl/nosnieuwsbuitenland',
         ]
         
-        total_inserted = 0
-        total_updated = 0
-        
         # Use a placeholder to show status
         status_placeholder = st.empty()
         status_placeholder.info("🔄 Controleren op nieuwe artikelen...")
         
         try:
-            for feed_url in feed_urls:
-                try:
-                    # Use LLM categorization for better accuracy
-                    result = fetch_and_upsert_articles(feed_url, max_items=30, use_llm_categorization=True)
-                    if result.get('success'):
-                        total_inserted += result.get('inserted', 0)
-                        total_updated += result.get('updated', 0)
-                except Exception as e:
-                    # Silently log errors but continue
-                    pass
-        
+            # Feeds are fetched concurrently; use LLM categorization for better accuracy
+            totals = fetch_and_upsert_feeds(feed_urls, max_items=30, use_llm_categorization=True)
+            total_inserted = totals['inserted']
+            
             # Update last fetch time
             st.session_state.last_fetch_time = time.time()
             
+            if totals['errors'] > 0:
+                print(f"{totals['errors']} feed entries could not be stored")
+            
             # Show brief status message
-            if total_inserted > 0 or total_updated > 0:
+            if total_inserted > 0:
                 status_placeholder.success(f"✅ {total_inserted} nieuwe artikelen gevonden")
                 time.sleep(2)  # Show message briefly
                 status_placeholder.empty()
@@ -893,11 +1005,7 @@ def check_and_fetch_new_articles():
 
 def render_nieuws_page():
     """Render main news overview page."""
-    # Ensure supabase is initialized
-    if st.session_state.supabase is None:
-        st.session_state.supabase = init_supabase()
-    
-    supabase = st.session_state.supabase
+    supabase = init_supabase()
     
     if not supabase:
         st.error("❌ Opslag niet geïnitialiseerd. Herlaad de pagina.")
@@ -905,23 +1013,19 @@ def render_nieuws_page():
     
     st.title("📰 Nieuws")
     
-    # Check if viewing article detail
-    if "article" in st.query_params:
-        render_article_detail(st.query_params["article"])
-        return
-    
     # Automatic article fetching disabled - articles are managed externally
     # check_and_fetch_new_articles()  # Disabled: articles stored in Supabase, no local fetching needed
     
+    if st.button("🔄 Artikelen Vernieuwen", key="refresh_articles"):
+        clear_article_caches()
+        st.rerun()
+    
     # Get user preferences
     blacklist = []
     selected_categories = None
     if st.session_state.user:
-        # Load preferences if not already loaded
-        if st.session_state.preferences is None:
-            user_id = get_user_attr(st.session_state.user, 'id')
-            if user_id:
-                st.session_state.preferences = supabase.get_user_preferences(user_id)
+        # Load preferences (cached per user id)
+        load_user_preferences()
         
         if st.session_state.preferences:
             blacklist = st.session_state.preferences.get('blacklist_keywords', [])
@@ -938,41 +1042,51 @@ def render_nieuws_page():
         else:
             st.info("🔍 Debug: Geen blacklist actief")
     
-    # Get articles
+    # Only apply category filter if user is logged in AND has selected categories
+    # If no user is logged in, show all articles (categories_filter = None)
+    if st.session_state.user and selected_categories and len(selected_categories) > 0:
+        categories_filter = selected_categories
+    else:
+        categories_filter = None
+    
+    # Ensure blacklist is properly formatted: filter out empty strings and normalize
+    blacklist_to_use = [kw.strip() for kw in blacklist if kw and kw.strip()] if isinstance(blacklist, list) else []
+    
+    render_article_list(tuple(categories_filter or ()), tuple(blacklist_to_use))
+
+
+@st.fragment
+def render_article_list(categories: tuple, blacklist: tuple):
+    """
+    Render the article grid of the Nieuws page with its "Meer laden" button.
+    
+    Runs as a fragment: loading the next page reruns only the list, not the
+    session restore, menu and preference loading around it.
+    """
     try:
-        if not supabase:
-            st.error("❌ Opslag niet geïnitialiseerd. Herlaad de pagina.")
-            articles = []
-        else:
-            # Only apply category filter if user is logged in AND has selected categories
-            # If no user is logged in, show all articles (categories_filter = None)
-            if st.session_state.user and selected_categories and len(selected_categories) > 0:
-                categories_filter = selected_categories
-            else:
-                categories_filter = None
-        
-        # Ensure blacklist is properly formatted
-        blacklist_to_use = None
-        if blacklist and isinstance(blacklist, list) and len(blacklist) > 0:
-            # Filter out empty strings and normalize
-            blacklist_to_use = [kw.strip() for kw in blacklist if kw and kw.strip()]
-            if len(blacklist_to_use) == 0:
-                blacklist_to_use = None
+        # Cursor pagination: "Meer laden" raises the number of loaded pages. Each page's
+        # cursor comes from the page fetched just before it in this run, so pages stay
+        # contiguous when earlier pages are refetched with new articles.
+        # Changing the filters starts again from the first page.
+        filter_key = (categories, blacklist)
+        if st.session_state.get('article_filter_key') != filter_key:
+            st.session_state.article_filter_key = filter_key
+            st.session_state.article_pages = 1
         
-        articles = supabase.get_articles(
-            limit=50,
-            category=None,
-            categories=categories_filter,
-            search_query=None,
-            blacklist_keywords=blacklist_to_use
-        )
+        articles = []
+        next_cursor = None
+        for _ in range(st.session_state.get('article_pages', 1)):
+            page_articles, next_cursor = _fetch_articles_page(*filter_key, cursor=next_cursor)
+            articles.extend(page_articles)
+            if next_cursor is None:
+                break
         
         # Debug output if no articles found
-        if len(articles) == 0:
+        if len(articles) == 0 and next_cursor is None:
             # Try fetching without category filters to see if that works
-            test_articles = supabase.get_articles(limit=5, category=None, categories=None, search_query=None, blacklist_keywords=blacklist_to_use)
+            test_articles = _fetch_articles((), blacklist, limit=5)
             if len(test_articles) > 0:
-                if selected_categories and len(selected_categories) > 0:
+                if categories:
                     st.warning(f"⚠️ Geen artikelen gevonden met de geselecteerde categorieën. Zonder categorie filter: {len(test_articles)} artikelen beschikbaar.")
                     st.info("💡 Tip: Selecteer meer categorieën op de 'Gebruiker' pagina, of controleer of artikelen de juiste categorieën hebben.")
                 else:
@@ -985,29 +1099,22 @@ def render_nieuws_page():
             st.info(f"🔍 Debug: {len(articles)} artikelen opgehaald")
     except Exception as e:
         st.error(f"Fout bij ophalen artikelen: {str(e)}")
-        import traceback
         st.exception(e)
         articles = []
+        next_cursor = None
     
-    # Display articles
-    if not articles:
-        st.info("ℹ️ Geen artikelen gevonden. Klik op '🔄 Artikelen Vernieuwen' om artikelen op te halen.")
-    else:
+    # Display articles (an empty page with a next cursor only offers "Meer laden")
+    if articles:
         st.subheader(f"Artikelen ({len(articles)})")
         
-        articles_list = list(articles)
-        num_rows = (len(articles_list) + 3) // 4
-        
-        for row in range(num_rows):
-            cols = st.columns(4)
-            for col_idx in range(4):
-                article_idx = row * 4 + col_idx
-                if article_idx < len(articles_list):
-                    with cols[col_idx]:
-                        render_article_card(articles_list[article_idx], supabase)
-        
-        if len(articles) >= 50:
-            st.info("ℹ️ Toon maximaal 50 artikelen. Gebruik filters om te verfijnen.")
+        render_article_grid(articles)
+    elif next_cursor is None:
+        st.info("ℹ️ Geen artikelen gevonden. Klik op '🔄 Artikelen Vernieuwen' om artikelen op te halen.")
+    
+    if next_cursor is not None:
+        if st.button("Meer laden", key="load_more_articles", use_container_width=True):
+            st.session_state.article_pages = st.session_state.get('article_pages', 1) + 1
+            st.rerun(scope="fragment")
 
 
 def render_waarom_page():
@@ -1033,13 +1140,6 @@ def render_waarom_page():
 
 def render_frustrate_page():
     """Render 'Dit wil je niet' page showing filtered articles."""
-    supabase = st.session_state.supabase
-    
-    # Check if viewing article detail
-    if "article" in st.query_params:
-        render_article_detail(st.query_params["article"])
-        return
-    
     st.title("Dit wil je niet")
     st.markdown("---")
     st.markdown("**Deze pagina toont alle artikelen die door de blacklist filter EN categorie filter zijn uitgefilterd.**")
@@ -1052,11 +1152,8 @@ def render_frustrate_page():
         st.info("Ga naar de 'Gebruiker' pagina om in te loggen.")
         return
     
-    # Load preferences if not already loaded
-    if st.session_state.preferences is None:
-        user_id = get_user_attr(st.session_state.user, 'id')
-        if user_id:
-            st.session_state.preferences = supabase.get_user_preferences(user_id)
+    # Load preferences (cached per user id)
+    load_user_preferences()
     
     # Get user preferences to know what was filtered
     blacklist = []
@@ -1071,7 +1168,7 @@ def render_frustrate_page():
     
     # Debug info
     if st.session_state.get('debug_mode', False):
-        user_id = get_user_attr(st.session_state.user, 'id', 'N/A')
+        user_id = current_user_id() or 'N/A'
         st.write(f"Debug - User ID: {user_id}")
         st.write(f"Debug - Preferences loaded: {st.session_state.preferences is not None}")
         if st.session_state.preferences:
@@ -1101,74 +1198,192 @@ def render_frustrate_page():
     
     # Get ALL articles without any filters
     try:
-        all_articles = supabase.get_articles(
-            limit=200,  # Get more articles
-            blacklist_keywords=None,  # No blacklist filter - get everything
-            categories=None  # No category filter - get everything
+        # Filtering happens in the database: only articles hidden by the blacklist
+        # and/or category filter are returned
+        filtered_articles = _fetch_filtered_out_articles(
+            tuple(selected_categories or ()),
+            tuple(kw.strip() for kw in (blacklist or []) if kw and kw.strip()),
+            limit=200
         )
         
-        # Now manually filter to find articles that WOULD be filtered
-        filtered_articles = []
-        for article in all_articles:
-            is_filtered = False
-            filter_reason = []
-            
-            # Check category filter
-            # New logic: Article is filtered out if ANY category is NOT in selected_categories
-            if selected_categories and len(selected_categories) > 0:
-                if not article_matches_category_filter(article, selected_categories):
-                    is_filtered = True
-                    filter_reason.append("Categorie filter")
-            
-            # Check blacklist filter
-            if blacklist:
-                title = (article.get('title') or '').lower()
-                description = (article.get('description') or '').lower()
-                full_content = (article.get('full_content') or '').lower()
-                
-                all_text = f"{title} {description} {full_content}"
-                
-                # Check if article contains any blacklisted keyword
-                for keyword in blacklist:
-                    keyword_lower = keyword.lower().strip()
-                    if keyword_lower and keyword_lower in all_text:
-                        is_filtered = True
-                        filter_reason.append(f"Blacklist: {keyword}")
-                        break  # Only add reason once per article
-            
-            if is_filtered:
-                article['_filter_reason'] = ', '.join(filter_reason)
-                filtered_articles.append(article)
-        
         if filtered_articles:
             st.subheader(f"📋 {len(filtered_articles)} uitgefilterde artikelen")
             st.caption("Deze artikelen worden normaal gesproken verborgen door je blacklist en/of categorie filters.")
             st.markdown("---")
             
             # Display filtered articles
-            articles_list = filtered_articles
-            num_cols = 4
-            
-            for row_start in range(0, len(articles_list), num_cols):
-                cols = st.columns(num_cols)
-                for col_idx, col in enumerate(cols):
-                    article_idx = row_start + col_idx
-                    if article_idx < len(articles_list):
-                        with col:
-                            render_article_card(articles_list[article_idx], supabase)
+            render_article_grid(filtered_articles)
         else:
             st.success("✅ Geen artikelen gevonden die door de blacklist worden uitgefilterd.")
             st.info("Dit betekent dat er momenteel geen artikelen zijn die je blacklist trefwoorden bevatten.")
     
     except Exception as e:
         st.error(f"Fout bij ophalen artikelen: {str(e)}")
-        import traceback
         st.code(traceback.format_exc())
 
 
+@st.fragment
+def render_statistics_panel(selected_categories: List[str], blacklist: List[str]):
+    """
+    Render included/excluded statistics per day.
+    
+    Runs as a fragment: switching the period reruns only this panel. The stats
+    are read through the cache (keyed on the filter values and period).
+    """
+    st.subheader("📊 Statistieken")
+    st.caption("Aantal artikelen per dag op basis van je voorkeuren")
+    
+    days = st.radio(
+        "Periode",
+        STATS_PERIOD_DAYS,
+        format_func=lambda d: f"{d} dagen",
+        horizontal=True,
+        key="stats_period_days"
+    )
+    
+    try:
+        stats_data = _cached_daily_stats(
+            tuple(selected_categories or ()),
+            tuple(blacklist or ()),
+            datetime.now(AMSTERDAM_TZ).date().isoformat(),
+            days=days
+        )
+        
+        # Display statistics
+        if stats_data:
+            # One frame feeds both the summary metrics and the daily table
+            daily = pd.DataFrame(stats_data)
+            totals = daily[['included', 'excluded', 'total']].sum()
+            
+            # Summary metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Totaal Inclusief", int(totals['included']))
+            with col2:
+                st.metric("Totaal Uitgesloten", int(totals['excluded']))
+            with col3:
+                st.metric("Totaal Artikelen", int(totals['total']))
+            
+            st.markdown("---")
+            
+            # Daily breakdown as one table (percentages computed per column)
+            daily = daily[daily['total'] > 0].assign(pct_included=lambda d: d['included'] / d['total'] * 100)
+            if not daily.empty:
+                st.caption("Per dag:")
+                st.dataframe(
+                    daily[['date', 'included', 'excluded', 'pct_included']],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        'date': "Datum",
+                        'included': st.column_config.NumberColumn("✅ Inclusief"),
+                        'excluded': st.column_config.NumberColumn("❌ Uitgesloten"),
+                        'pct_included': st.column_config.ProgressColumn(
+                            "Inclusief %", format="%.1f%%", min_value=0, max_value=100
+                        ),
+                    }
+                )
+        else:
+            st.info(f"Geen artikelen gevonden in de afgelopen {days} dagen.")
+            
+    except Exception as e:
+        st.error(f"Fout bij berekenen statistieken: {str(e)}")
+        if st.session_state.get('debug_mode', False):
+            st.code(traceback.format_exc())
+
+
+@st.fragment
+def render_preferences_editor(supabase, selected_categories: List[str], blacklist: List[str]):
+    """
+    Render the blacklist and category editors of the user page.
+    
+    Runs as a fragment: adding or removing a keyword reruns only this editor.
+    Both editors are saved together by the form's single "Opslaan" button, in
+    one update; that calls st.rerun() with the default app scope, so the
+    statistics panel picks up the new preferences.
+    """
+    user_id = current_user_id()
+    loaded_blacklist = list(blacklist or [])
+    all_categories = CATEGORIES
+    # The multiselect only accepts known categories
+    loaded_categories = [cat for cat in all_categories if cat in frozenset(selected_categories)]
+    
+    # Edits are kept in session state until they are saved. They are re-seeded
+    # whenever the loaded preferences change (other user, or saved elsewhere and
+    # reloaded after the get_prefs TTL), so stale edits never overwrite newer prefs.
+    loaded_key = (user_id, tuple(loaded_blacklist), tuple(loaded_categories))
+    if st.session_state.get('pending_prefs_loaded') != loaded_key:
+        st.session_state.pending_prefs_loaded = loaded_key
+        st.session_state.pending_blacklist = loaded_blacklist
+        st.session_state.cat_pref_multi = loaded_categories
+    pending_blacklist = st.session_state.pending_blacklist
+    
+    # Blacklist management
+    st.subheader("🚫 Blacklist Trefwoorden")
+    st.caption("Artikelen met deze woorden worden verborgen")
+    
+    if pending_blacklist:
+        for keyword in list(pending_blacklist):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.text(keyword)
+            with col2:
+                if st.button("❌", key=f"remove_{keyword}", use_container_width=True):
+                    pending_blacklist.remove(keyword)
+                    st.rerun(scope="fragment")
+    else:
+        st.info("Geen trefwoorden in blacklist")
+    
+    with st.form("add_keyword_form", clear_on_submit=True, border=False):
+        new_keyword = st.text_input("Nieuw trefwoord toevoegen", key="new_keyword")
+        add_keyword = st.form_submit_button("➕ Toevoegen", use_container_width=True)
+    if add_keyword and new_keyword and new_keyword.strip():
+        keyword = new_keyword.strip()
+        if keyword not in pending_blacklist:
+            pending_blacklist.append(keyword)
+            st.rerun(scope="fragment")
+        else:
+            st.warning("Dit trefwoord staat al in de blacklist")
+    
+    st.markdown("---")
+    
+    # Category selection
+    st.subheader("📂 Categorieën")
+    st.caption("Selecteer welke categorieën je wilt zien")
+    
+    if pending_blacklist != loaded_blacklist:
+        st.caption("⚠️ Niet-opgeslagen wijzigingen in de blacklist; \"Opslaan\" bewaart ze samen met de categorieën")
+    
+    # Inside a form, changing the selection doesn't rerun anything until "Opslaan"
+    with st.form("category_preferences_form", border=False):
+        # One widget for all categories; its value is seeded through session state above
+        new_selected = st.multiselect(
+            "Categorieën",
+            options=all_categories,
+            key="cat_pref_multi",
+            label_visibility="collapsed"
+        )
+        
+        save_preferences = st.form_submit_button("💾 Opslaan", use_container_width=True)
+    
+    if save_preferences:
+        # Categories and blacklist are written together in one update
+        changes = {}
+        if set(new_selected) != set(loaded_categories):
+            changes['selected_categories'] = new_selected
+        if pending_blacklist != loaded_blacklist:
+            changes['blacklist_keywords'] = list(pending_blacklist)
+        if changes:
+            if user_id and supabase.update_user_preferences(user_id, **changes):
+                invalidate_user_preferences()
+                st.rerun()
+            else:
+                st.error("❌ Fout bij opslaan van voorkeuren")
+
+
 def render_gebruiker_page():
     """Render user page with login/logout and preferences."""
-    supabase = st.session_state.supabase
+    supabase = get_supabase()
     
     st.title("👤 Gebruiker")
     st.markdown("---")
@@ -1188,7 +1403,7 @@ def render_gebruiker_page():
             
             if login_submitted:
                 # Prevent login with test@local.com (mock user for local testing only)
-                if email.lower() == 'test@local.com':
+                if email.lower() in BLOCKED_EMAILS:
                     st.error("Dit is een test account voor lokale ontwikkeling. Gebruik een echt account.")
                     return
                 
@@ -1196,18 +1411,11 @@ def render_gebruiker_page():
                 if result.get('success'):
                     user = result.get('user')
                     # Convert user to dict if it's a Pydantic object
-                    if user and not isinstance(user, dict):
-                        user_dict = {
-                            'id': get_user_attr(user, 'id'),
-                            'email': get_user_attr(user, 'email'),
-                            'created_at': get_user_attr(user, 'created_at')
-                        }
-                    else:
-                        user_dict = user
+                    user_dict = session_user_dict(user) if user else user
                     
                     # Double-check: never allow test@local.com
-                    user_email = get_user_attr(user_dict, 'email', '')
-                    if user_email and user_email.lower() == 'test@local.com':
+                    user_email = (user_dict or {}).get('email') or ''
+                    if user_email and user_email.lower() in BLOCKED_EMAILS:
                         st.error("Dit account kan niet worden gebruikt.")
                         try:
                             supabase.sign_out()
@@ -1217,20 +1425,14 @@ def render_gebruiker_page():
                     
                     # Store user in session state - this persists across reruns in the same browser session
                     st.session_state.user = user_dict
-                    st.session_state.preferences = None
                     
-                    # Store session token in cookie for persistence across page reloads
+                    # Store session tokens and email in one cookie (30 days) for persistence across page reloads
                     if result.get('access_token'):
-                        # Store in cookie (30 days expiration)
-                        set_cookie("supabase_access_token", result.get('access_token'), days=30)
                         st.session_state.supabase_session_token = result.get('access_token')
                     if result.get('refresh_token'):
-                        set_cookie("supabase_refresh_token", result.get('refresh_token'), days=30)
                         st.session_state.supabase_refresh_token = result.get('refresh_token')
-                    
-                    # Also store user email in cookie for quick display
-                    if user_email:
-                        set_cookie("user_email", user_email, days=30)
+                    if result.get('access_token') or user_email:
+                        set_auth_cookie(result.get('access_token'), result.get('refresh_token'), user_email, days=30)
                     
                     # Also verify the session is stored in Supabase client
                     # The Supabase client should have the session from sign_in response
@@ -1260,7 +1462,7 @@ def render_gebruiker_page():
                         st.error(f"Registratie mislukt: {result.get('error', 'Onbekende fout')}")
     else:
         # User is logged in
-        user_email = get_user_attr(st.session_state.user, 'email', 'Gebruiker')
+        user_email = current_user_email('Gebruiker')
         st.success(f"👤 Ingelogd als: {user_email}")
         
         if st.button("🚪 Uitloggen", use_container_width=True):
@@ -1273,27 +1475,19 @@ def render_gebruiker_page():
             
             # Clear session state and tokens
             st.session_state.user = None
-            st.session_state.preferences = None
             st.session_state.supabase_session_token = None
             st.session_state.supabase_refresh_token = None
             
             # Clear cookies
-            set_cookie("supabase_access_token", "")
-            set_cookie("supabase_refresh_token", "")
-            set_cookie("user_email", "")
+            clear_cookies()
             
             # Force rerun to update UI
             st.rerun()
         
         st.markdown("---")
         
-        # Get preferences
-        if st.session_state.preferences is None:
-            user_id = get_user_attr(st.session_state.user, 'id')
-            if user_id:
-                st.session_state.preferences = supabase.get_user_preferences(user_id)
-        
-        prefs = st.session_state.preferences
+        # Get preferences (cached per user id)
+        prefs = load_user_preferences()
         blacklist = prefs.get('blacklist_keywords', []) if prefs else []
         selected_categories = prefs.get('selected_categories', []) if prefs else []
         
@@ -1301,73 +1495,7 @@ def render_gebruiker_page():
         if selected_categories is None or not isinstance(selected_categories, list):
             selected_categories = []
         
-        # Category selection
-        st.subheader("📂 Categorieën")
-        st.caption("Selecteer welke categorieën je wilt zien")
-        
-        from categorization_engine import get_all_categories
-        all_categories = get_all_categories()
-        category_selections = {}
-        
-        # Ensure selected_categories is a list before using 'in' operator
-        if not isinstance(selected_categories, list):
-            selected_categories = []
-        
-        for category in all_categories:
-            category_selections[category] = st.checkbox(
-                category,
-                value=category in selected_categories,
-                key=f"cat_pref_{category}"
-            )
-        
-        new_selected = [cat for cat, selected in category_selections.items() if selected]
-        
-        # Save button for categories
-        if st.button("💾 Opslaan", key="save_categories", use_container_width=True):
-            user_id = get_user_attr(st.session_state.user, 'id')
-            if user_id and supabase.update_user_preferences(user_id, selected_categories=new_selected):
-                st.session_state.preferences = None
-                st.success("✅ Categorieën opgeslagen! Statistieken worden bijgewerkt...")
-                st.rerun()
-            else:
-                st.error("❌ Fout bij opslaan van categorieën")
-        
-        st.markdown("---")
-        
-        # Blacklist management
-        st.subheader("🚫 Blacklist Trefwoorden")
-        st.caption("Artikelen met deze woorden worden verborgen")
-        
-        if blacklist:
-            for keyword in blacklist:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    st.text(keyword)
-                with col2:
-                    if st.button("❌", key=f"remove_{keyword}", use_container_width=True):
-                        blacklist.remove(keyword)
-                        user_id = get_user_attr(st.session_state.user, 'id')
-                        if user_id:
-                            supabase.update_user_preferences(user_id, blacklist_keywords=blacklist)
-                        st.session_state.preferences = None
-                        st.rerun()
-        else:
-            st.info("Geen trefwoorden in blacklist")
-        
-        st.markdown("---")
-        new_keyword = st.text_input("Nieuw trefwoord toevoegen", key="new_keyword")
-        if st.button("➕ Toevoegen", use_container_width=True):
-            if new_keyword and new_keyword.strip():
-                keyword = new_keyword.strip()
-                if keyword not in blacklist:
-                    blacklist.append(keyword)
-                    user_id = get_user_attr(st.session_state.user, 'id')
-                    if user_id and supabase.update_user_preferences(user_id, blacklist_keywords=blacklist):
-                        st.session_state.preferences = None
-                        st.success(f"'{keyword}' toegevoegd")
-                        st.rerun()
-                else:
-                    st.warning("Dit trefwoord staat al in de blacklist")
+        render_preferences_editor(supabase, selected_categories, blacklist)
         
         st.markdown("---")
         
@@ -1375,12 +1503,8 @@ def render_gebruiker_page():
         st.subheader("🔄 Her-categoriseren met LLM")
         st.caption("Her-categoriseer artikelen die nog geen LLM-categorisatie hebben")
         
-        from categorization_engine import is_llm_available
-        
         if is_llm_available():
             if st.button("🔄 Her-categoriseer artikelen zonder LLM", use_container_width=True, key="recategorize_without_llm"):
-                from articles_repository import recategorize_articles_without_llm
-                
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 article_text = st.empty()
@@ -1397,13 +1521,15 @@ def render_gebruiker_page():
                 progress_bar.progress(0.05)
                 
                 try:
-                    result = recategorize_articles_without_llm(limit=50, progress_callback=update_progress)
+                    result = recategorize_articles_without_llm(limit=50, progress_callback=update_progress, batch_size=50)
                 except Exception as e:
                     st.error(f"Fout tijdens her-categoriseren: {str(e)}")
                     result = {'success': False, 'error': str(e)}
                 
                 progress_bar.progress(1.0)
                 article_text.empty()
+                # Categories changed, drop cached article lists
+                clear_article_caches()
                 
                 if result.get('success'):
                     processed = result.get('processed', 0)
@@ -1427,7 +1553,6 @@ def render_gebruiker_page():
                 else:
                     st.error(f"Fout: {result.get('error', 'Onbekende fout')}")
                 
-                import time
                 time.sleep(2)
                 st.rerun()
         else:
@@ -1437,155 +1562,46 @@ def render_gebruiker_page():
         st.markdown("---")
         
         # Statistics: Articles included/excluded per day
-        st.subheader("📊 Statistieken")
-        st.caption("Aantal artikelen per dag op basis van je voorkeuren")
-        
-        try:
-            # Get all articles from the last 7 days
-            from datetime import datetime, timedelta
-            import pytz
-            
-            amsterdam_tz = pytz.timezone('Europe/Amsterdam')
-            now = datetime.now(amsterdam_tz)
-            seven_days_ago = now - timedelta(days=7)
-            
-            # Get all articles (we'll filter in Python to calculate stats)
-            all_articles = supabase.get_articles(limit=500, category=None, categories=None, search_query=None, blacklist_keywords=None)
-            
-            # Filter articles by date (last 7 days)
-            recent_articles = []
-            for article in all_articles:
-                if article.get('published_at'):
-                    try:
-                        from dateutil import parser
-                        pub_date = parser.parse(article['published_at'])
-                        if pub_date.tzinfo is None:
-                            pub_date = pytz.utc.localize(pub_date)
-                        pub_date = pub_date.astimezone(amsterdam_tz)
-                        
-                        if pub_date >= seven_days_ago:
-                            recent_articles.append(article)
-                    except:
-                        pass
-            
-            # Group articles by date
-            articles_by_date = {}
-            for article in recent_articles:
-                try:
-                    from dateutil import parser
-                    pub_date = parser.parse(article['published_at'])
-                    if pub_date.tzinfo is None:
-                        pub_date = pytz.utc.localize(pub_date)
-                    pub_date = pub_date.astimezone(amsterdam_tz)
-                    date_key = pub_date.strftime('%Y-%m-%d')
-                    
-                    if date_key not in articles_by_date:
-                        articles_by_date[date_key] = []
-                    articles_by_date[date_key].append(article)
-                except:
-                    pass
-            
-            # Calculate included/excluded for each day
-            stats_data = []
-            for date_key in sorted(articles_by_date.keys(), reverse=True):
-                day_articles = articles_by_date[date_key]
-                
-                included = 0
-                excluded = 0
-                
-                for article in day_articles:
-                    # Check if article matches user preferences
-                    is_included = True
-                    
-                    # Check category filter
-                    # New logic: Article is filtered out if ANY category is NOT in selected_categories
-                    if selected_categories:
-                        if not article_matches_category_filter(article, selected_categories):
-                            is_included = False
-                    
-                    # Check blacklist
-                    if is_included and blacklist:
-                        title = (article.get('title') or '').lower()
-                        description = (article.get('description') or '').lower()
-                        full_content = (article.get('full_content') or '').lower()
-                        all_text = f"{title} {description} {full_content}"
-                        
-                        for keyword in blacklist:
-                            if keyword.lower().strip() in all_text:
-                                is_included = False
-                                break
-                    
-                    if is_included:
-                        included += 1
-                    else:
-                        excluded += 1
-                
-                # Format date for display
-                try:
-                    from dateutil import parser
-                    date_obj = parser.parse(date_key)
-                    date_display = date_obj.strftime('%d %B %Y')
-                except:
-                    date_display = date_key
-                
-                stats_data.append({
-                    'date': date_display,
-                    'included': included,
-                    'excluded': excluded,
-                    'total': included + excluded
-                })
-            
-            # Display statistics
-            if stats_data:
-                # Summary metrics
-                col1, col2, col3 = st.columns(3)
-                total_included = sum(s['included'] for s in stats_data)
-                total_excluded = sum(s['excluded'] for s in stats_data)
-                total_articles = sum(s['total'] for s in stats_data)
-                
-                with col1:
-                    st.metric("Totaal Inclusief", total_included)
-                with col2:
-                    st.metric("Totaal Uitgesloten", total_excluded)
-                with col3:
-                    st.metric("Totaal Artikelen", total_articles)
-                
-                st.markdown("---")
-                
-                # Daily breakdown
-                st.caption("Per dag:")
-                for stat in stats_data:
-                    if stat['total'] > 0:
-                        percentage_included = (stat['included'] / stat['total']) * 100 if stat['total'] > 0 else 0
-                        st.write(f"**{stat['date']}**")
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.write(f"✅ Inclusief: {stat['included']} ({percentage_included:.1f}%)")
-                        with col2:
-                            st.write(f"❌ Uitgesloten: {stat['excluded']} ({100 - percentage_included:.1f}%)")
-                        st.progress(percentage_included / 100)
-            else:
-                st.info("Geen artikelen gevonden in de afgelopen 7 dagen.")
-                
-        except Exception as e:
-            st.error(f"Fout bij berekenen statistieken: {str(e)}")
-            import traceback
-            if st.session_state.get('debug_mode', False):
-                st.code(traceback.format_exc())
+        render_statistics_panel(selected_categories, blacklist)
+
+
+def _maybe_render_article_detail() -> bool:
+    """Render the article from ?article=<id> if present; page renderers can assume it isn't."""
+    article_id = st.query_params.get("article")
+    if not article_id:
+        return False
+    render_article_detail(article_id)
+    return True
+
+
+# Page key -> render function (keys match MENU_PAGES)
+PAGE_RENDERERS = {
+    "Nieuws": render_nieuws_page,
+    "Waarom": render_waarom_page,
+    "Frustrate": render_frustrate_page,
+    "Gebruiker": render_gebruiker_page,
+}
 
 
 def main():
     """Main Streamlit app."""
     # Start background scheduler for automatic RSS fetching
-    if not is_scheduler_running():
-        start_background_scheduler()
+    start_background_scheduler()
+    
+    # Cached article data is stale once the scheduler has stored new articles
+    data_version = get_data_version()
+    if st.session_state.get('data_version', data_version) != data_version:
+        clear_article_caches()
+    st.session_state.data_version = data_version
     
     # Read cookies on first load and store in session state
-    # This needs to happen before checking user state
+    # This needs to happen before checking user state. Later code only uses the
+    # session state copies, so a logout within this session isn't undone.
     if '_cookies_read' not in st.session_state:
-        cookie_token = get_cookie("supabase_access_token")
-        cookie_refresh = get_cookie("supabase_refresh_token")
-        cookie_email = get_cookie("user_email")
+        auth_cookie = read_auth_cookie(read_cookies())
+        cookie_token = auth_cookie['access_token']
+        cookie_refresh = auth_cookie['refresh_token']
+        cookie_email = auth_cookie['email']
         if cookie_token:
             st.session_state.supabase_session_token = cookie_token
         if cookie_refresh:
@@ -1595,8 +1611,7 @@ def main():
         st.session_state['_cookies_read'] = True
     
     # Render header image with abstract sunrise
-    st.markdown('<div class="header-image-container"></div>', unsafe_allow_html=True)
-    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="header-image-container"></div><br>', unsafe_allow_html=True)
     
     # Initialize storage
     supabase = init_supabase()
@@ -1616,15 +1631,29 @@ def main():
     
     # Always try to restore session from cookies if tokens are available
     # This ensures the Supabase client has an active session even if session state was cleared
+    # Session handling only applies to Supabase, not the LocalStorage fallback
+    uses_supabase = LocalStorage is None or not isinstance(supabase, LocalStorage)
+    
     try:
-        from local_storage import LocalStorage
-        if not isinstance(supabase, LocalStorage):
-            cookie_access_token = st.session_state.get('supabase_session_token') or get_cookie("supabase_access_token")
-            cookie_refresh_token = st.session_state.get('supabase_refresh_token') or get_cookie("supabase_refresh_token")
+        if uses_supabase:
+            cookie_access_token = st.session_state.get('supabase_session_token')
+            cookie_refresh_token = st.session_state.get('supabase_refresh_token')
             
-            # Always restore session if we have tokens (even if user is in session state)
+            # Tokens verified locally that are already active on the client need
+            # no Supabase Auth round trip
+            claims = verify_access_token(cookie_access_token)
+            client_session = supabase.get_session() if claims else None
+            if claims and getattr(client_session, 'access_token', None) == cookie_access_token:
+                st.session_state.supabase_session_token = cookie_access_token
+                st.session_state.supabase_refresh_token = cookie_refresh_token
+                user_email = claims.get('email') or ''
+                if st.session_state.user is None and is_allowed_email(user_email):
+                    st.session_state.user = user_from_claims(claims)
+                    st.session_state['_cookie_user_email'] = user_email
+            
+            # Otherwise restore session if we have tokens (even if user is in session state)
             # This ensures Supabase client has active session for API calls
-            if cookie_access_token and cookie_refresh_token:
+            elif cookie_access_token and cookie_refresh_token:
                 try:
                     session_result = supabase.set_session(cookie_access_token, cookie_refresh_token)
                     # Always update session state tokens
@@ -1636,57 +1665,44 @@ def main():
                         current_user = session_result.get('user')
                         if current_user:
                             user_email = get_user_attr(current_user, 'email', '')
-                            if user_email and user_email.lower() != 'test@local.com':
-                                if not isinstance(current_user, dict):
-                                    st.session_state.user = {
-                                        'id': get_user_attr(current_user, 'id'),
-                                        'email': get_user_attr(current_user, 'email'),
-                                        'created_at': get_user_attr(current_user, 'created_at')
-                                    }
-                                else:
-                                    st.session_state.user = current_user
-                                st.session_state.preferences = None
+                            if is_allowed_email(user_email):
+                                st.session_state.user = session_user_dict(current_user)
                                 if user_email:
                                     st.session_state['_cookie_user_email'] = user_email
                 except Exception:
                     # Session restore failed, will try other methods below
                     pass
-    except ImportError:
-        pass
     except Exception:
         pass
     
-    if st.session_state.user is None:
+    # Restore the user at most once per session: after a success the user is in
+    # session state, after a failure the user logs in on the 'Gebruiker' page
+    if st.session_state.user is None and not st.session_state.get('_auth_restored'):
+        st.session_state['_auth_restored'] = True
         try:
             # Only check for persisted session if we're using Supabase (not LocalStorage)
-            from local_storage import LocalStorage
-            if not isinstance(supabase, LocalStorage):
+            if uses_supabase:
                 # Method 1: Check cookie for stored session tokens and restore session
-                cookie_access_token = st.session_state.get('supabase_session_token') or get_cookie("supabase_access_token")
-                cookie_refresh_token = st.session_state.get('supabase_refresh_token') or get_cookie("supabase_refresh_token")
-                cookie_email = st.session_state.get('_cookie_user_email') or get_cookie("user_email")
+                cookie_access_token = st.session_state.get('supabase_session_token')
+                cookie_refresh_token = st.session_state.get('supabase_refresh_token')
+                cookie_email = st.session_state.get('_cookie_user_email')
+                
+                # Looked up at most once; shared by the Method 1 fallback and Method 2
+                current_user = None
+                current_user_checked = False
                 
-                if cookie_access_token and cookie_refresh_token and cookie_email and cookie_email.lower() != 'test@local.com':
+                if cookie_access_token and cookie_refresh_token and is_allowed_email(cookie_email):
                     # We have tokens in cookies - restore the Supabase session
                     try:
                         # Restore session using tokens
                         session_result = supabase.set_session(cookie_access_token, cookie_refresh_token)
                         if session_result and session_result.get('success'):
-                            current_user = session_result.get('user')
-                            if current_user:
-                                user_email = get_user_attr(current_user, 'email', '')
+                            session_user = session_result.get('user')
+                            if session_user:
+                                user_email = get_user_attr(session_user, 'email', '')
                                 # Verify the email matches the cookie
-                                if user_email and user_email.lower() == cookie_email.lower() and user_email.lower() != 'test@local.com':
-                                    # Convert to dict format for consistency
-                                    if not isinstance(current_user, dict):
-                                        st.session_state.user = {
-                                            'id': get_user_attr(current_user, 'id'),
-                                            'email': get_user_attr(current_user, 'email'),
-                                            'created_at': get_user_attr(current_user, 'created_at')
-                                        }
-                                    else:
-                                        st.session_state.user = current_user
-                                    st.session_state.preferences = None  # Will be loaded when needed
+                                if is_allowed_email(user_email) and user_email.lower() == cookie_email.lower():
+                                    st.session_state.user = session_user_dict(session_user)
                                     # Update session state tokens from cookie
                                     st.session_state.supabase_session_token = cookie_access_token
                                     st.session_state.supabase_refresh_token = cookie_refresh_token
@@ -1694,80 +1710,55 @@ def main():
                         else:
                             # Session restore failed, try get_current_user as fallback
                             current_user = supabase.get_current_user()
+                            current_user_checked = True
                             if current_user:
                                 user_email = get_user_attr(current_user, 'email', '')
-                                if user_email and user_email.lower() == cookie_email.lower() and user_email.lower() != 'test@local.com':
-                                    if not isinstance(current_user, dict):
-                                        st.session_state.user = {
-                                            'id': get_user_attr(current_user, 'id'),
-                                            'email': get_user_attr(current_user, 'email'),
-                                            'created_at': get_user_attr(current_user, 'created_at')
-                                        }
-                                    else:
-                                        st.session_state.user = current_user
-                                    st.session_state.preferences = None
+                                if is_allowed_email(user_email) and user_email.lower() == cookie_email.lower():
+                                    st.session_state.user = session_user_dict(current_user)
                                     st.session_state.supabase_session_token = cookie_access_token
                                     st.session_state.supabase_refresh_token = cookie_refresh_token
                     except Exception as e:
                         # Session might be expired or invalid, clear cookies
-                        set_cookie("supabase_access_token", "")
-                        set_cookie("supabase_refresh_token", "")
-                        set_cookie("user_email", "")
+                        clear_cookies()
                         st.session_state.supabase_session_token = None
                         st.session_state.supabase_refresh_token = None
                 
                 # Method 2: Fallback to Supabase client's persisted session (localStorage)
                 if st.session_state.user is None:
                     try:
-                        current_user = supabase.get_current_user()
+                        if not current_user_checked:
+                            current_user = supabase.get_current_user()
                         if current_user:
                             user_email = get_user_attr(current_user, 'email', '')
                             # NEVER restore test@local.com - it's a mock user for local testing only
-                            if user_email and user_email.lower() != 'test@local.com':
-                                # Convert to dict format for consistency
-                                if not isinstance(current_user, dict):
-                                    st.session_state.user = {
-                                        'id': get_user_attr(current_user, 'id'),
-                                        'email': get_user_attr(current_user, 'email'),
-                                        'created_at': get_user_attr(current_user, 'created_at')
-                                    }
-                                else:
-                                    st.session_state.user = current_user
-                                st.session_state.preferences = None  # Will be loaded when needed
+                            if is_allowed_email(user_email):
+                                st.session_state.user = session_user_dict(current_user)
                                 
                                 # Also update cookie to keep it in sync
-                                set_cookie("user_email", user_email, days=30)
+                                set_auth_cookie(
+                                    st.session_state.get('supabase_session_token'),
+                                    st.session_state.get('supabase_refresh_token'),
+                                    user_email,
+                                    days=30
+                                )
                         else:
                             # No valid session - clear cookies
-                            set_cookie("supabase_access_token", "")
-                            set_cookie("supabase_refresh_token", "")
-                            set_cookie("user_email", "")
+                            clear_cookies()
                     except Exception:
                         # No session available - clear cookies
-                        set_cookie("supabase_access_token", "")
-                        set_cookie("supabase_refresh_token", "")
-                        set_cookie("user_email", "")
-        except ImportError:
-            # LocalStorage not available - this is fine, we're using Supabase
-            pass
+                        clear_cookies()
         except Exception as e:
             # Any other error - don't log, user will need to log in manually
             pass
     
     # Render horizontal menu
+    # Session restore above has already settled st.session_state.user, so the
+    # menu and page see the restored user in this same run (no st.rerun needed)
     render_horizontal_menu()
     
-    # Render current page
-    page = st.session_state.current_page
-    
-    if page == "Nieuws":
-        render_nieuws_page()
-    elif page == "Waarom":
-        render_waarom_page()
-    elif page == "Frustrate":
-        render_frustrate_page()
-    elif page == "Gebruiker":
-        render_gebruiker_page()
+    # Render the opened article (?article=<id>) or the current page
+    if not _maybe_render_article_detail():
+        PAGE_RENDERERS.get(st.session_state.current_page, render_nieuws_page)()
 
 
 if __name__ == "__main__":
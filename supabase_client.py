@@ -2,7 +2,7 @@
 Supabase client for authentication and database operations.
 """
 import os
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 try:
     from supabase import create_client, Client
     from supabase.lib.client_options import ClientOptions
@@ -11,6 +11,28 @@ except ImportError:
     Client = None
     ClientOptions = None
 
+from nlp_utils import blacklist_matcher, article_search_text
+from categorization_engine import CATEGORIES
+
+
+def _postgrest_quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=(...) filter."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _ilike_contains(keyword: str) -> str:
+    """Build an ILIKE 'contains' pattern with %, _ and \\ escaped."""
+    escaped = keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _excluded_categories(selected_categories: Optional[List[str]]) -> List[str]:
+    """Lowercased valid categories that are not selected (empty selection = no category filter)."""
+    if not selected_categories:
+        return []
+    selected_lower = {cat.lower().strip() for cat in selected_categories if cat}
+    return [cat.lower().strip() for cat in CATEGORIES if cat.lower().strip() not in selected_lower]
+
 
 class SupabaseClient:
     """Wrapper for Supabase client with auth and database operations."""
@@ -31,10 +53,7 @@ class SupabaseClient:
         # Try to create client with options, fallback to simple initialization
         try:
             if ClientOptions:
-                options = ClientOptions(
-                    auto_refresh_token=True,
-                    persist_session=True
-                )
+                options = self._client_options()
                 self.client: Client = create_client(
                     supabase_url,
                     supabase_key,
@@ -52,6 +71,31 @@ class SupabaseClient:
                 supabase_key
             )
     
+    @staticmethod
+    def _client_options():
+        """
+        Client options with one shared keep-alive HTTP connection pool.
+        
+        Older supabase versions don't accept an httpx_client; they keep
+        their own pool per sub-client.
+        """
+        try:
+            import httpx
+            http_client = httpx.Client(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+            return ClientOptions(
+                auto_refresh_token=True,
+                persist_session=True,
+                httpx_client=http_client
+            )
+        except (ImportError, TypeError):
+            return ClientOptions(
+                auto_refresh_token=True,
+                persist_session=True
+            )
+    
     # Authentication methods
     def sign_up(self, email: str, password: str) -> Dict[str, Any]:
         """Sign up a new user."""
@@ -288,6 +332,54 @@ class SupabaseClient:
             print(f"Error upserting article: {e}")
             return False
     
+    def update_article_categories(self, updates: List[Dict[str, Any]]) -> bool:
+        """
+        Write only categories and categorization_llm for several articles.
+        
+        Uses the update_article_categories RPC (one set-based UPDATE per call). A
+        partial upsert can't be used: its insert half would violate the NOT NULL
+        columns. Falls back to one UPDATE per distinct category set if the
+        function is not installed yet.
+        """
+        if not updates:
+            return True
+        rows = [
+            {
+                'id': update['id'],
+                'categories': list(update.get('categories') or []),
+                'categorization_llm': update.get('categorization_llm') or 'Keywords'
+            }
+            for update in updates
+        ]
+        
+        try:
+            self.client.rpc('update_article_categories', {'p_rows': rows}).execute()
+            return True
+        except Exception as e:
+            print(f"update_article_categories RPC not available, updating per category set: {e}")
+        
+        try:
+            groups: Dict[Tuple[Tuple[str, ...], str], List[str]] = {}
+            for row in rows:
+                groups.setdefault((tuple(row['categories']), row['categorization_llm']), []).append(row['id'])
+            
+            for (categories, llm), ids in groups.items():
+                self.client.table('articles').update({
+                    'categories': list(categories),
+                    'categorization_llm': llm
+                }).in_('id', ids).execute()
+            return True
+        except Exception as e:
+            print(f"Error updating article categories: {e}")
+            return False
+    
+    def get_existing_stable_ids(self, stable_ids: List[str]) -> set:
+        """Return the subset of stable_ids that already exist (single query)."""
+        if not stable_ids:
+            return set()
+        response = self.client.table('articles').select('stable_id').in_('stable_id', list(stable_ids)).execute()
+        return {row['stable_id'] for row in (response.data or [])}
+    
     def get_articles(
         self,
         limit: int = 50,
@@ -311,106 +403,210 @@ class SupabaseClient:
             response = query.execute()
             articles = response.data if response.data else []
             
-            # Filter by category (check both category field and categories array)
-            if category:
-                filtered = []
-                for article in articles:
-                    article_category = article.get('category', '')
-                    article_categories = article.get('categories', []) or []
-                    # Check if category matches either the single category field or is in the array
-                    if article_category == category or category in article_categories:
-                        filtered.append(article)
-                articles = filtered
-            
-            # Filter by categories array (if provided)
-            # Logic: Article is INCLUDED ONLY if ALL its categories are in the selected list
-            # If ANY category is NOT in the selected list, filter it out
-            # Special case: If categories is empty/None, don't filter (show all)
-            if categories and len(categories) > 0:
-                filtered = []
-                categories_lower = [cat.lower().strip() for cat in categories if cat]
-                # Import valid categories list
-                from categorization_engine import CATEGORIES
-                valid_categories_lower = [cat.lower().strip() for cat in CATEGORIES]
+            return self._filter_articles(articles, category, categories, search_query, blacklist_keywords)
+        except Exception as e:
+            import traceback
+            print(f"Error getting articles: {e}")
+            traceback.print_exc()
+            return []
+    
+    def get_articles_page(
+        self,
+        limit: int = 25,
+        cursor: Optional[Tuple[str, str]] = None,
+        categories: Optional[List[str]] = None,
+        blacklist_keywords: Optional[List[str]] = None,
+        max_reads: int = 8
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Get one page of articles using keyset (cursor) pagination.
+        
+        The category and blacklist filters run in Python, so rows are read in
+        chunks of `limit` until `limit` articles pass the filters, the table runs
+        out, or `max_reads` chunks have been read.
+        
+        Args:
+            limit: Number of articles per page (also the number of rows per read)
+            cursor: (published_at, id) of the last row of the previous page, or None for the first page
+            max_reads: Maximum number of reads for one page
+        
+        Returns:
+            Tuple of (filtered articles, cursor for the next page or None if there are no more rows)
+        """
+        try:
+            articles = []
+            for _ in range(max_reads):
+                query = self.client.table('articles').select('*')
+                if cursor:
+                    published_at, article_id = (_postgrest_quote(str(value)) for value in cursor)
+                    query = query.or_(f"published_at.lt.{published_at},and(published_at.eq.{published_at},id.lt.{article_id})")
+                query = query.order('published_at', desc=True).order('id', desc=True).limit(limit)
                 
-                for article in articles:
-                    # Collect all categories from the article (only valid ones)
-                    article_cats = []
-                    article_category = article.get('category', '')
-                    # Only add if it's a valid category
-                    if article_category and article_category.lower().strip() in valid_categories_lower:
-                        article_cats.append(article_category)
-                    article_categories_array = article.get('categories', []) or []
-                    if article_categories_array:
-                        for cat in article_categories_array:
-                            if cat and cat.lower().strip() in valid_categories_lower:
-                                article_cats.append(cat)
-                    article_cats = [cat for cat in article_cats if cat]
-                    article_cats = list(set(article_cats))  # Remove duplicates
-                    
-                    # If article has no categories, include it
-                    if not article_cats:
-                        filtered.append(article)
-                        continue
-                    
-                    # Check if ALL article categories are in the selected list
-                    # If ANY category is NOT in the list, filter it out
-                    # Case-insensitive comparison
-                    all_match = True
-                    for cat in article_cats:
-                        if cat and cat.lower().strip() not in categories_lower:
-                            all_match = False
-                            break
-                    
-                    if all_match:
-                        filtered.append(article)
-                articles = filtered
-            
-            # Apply search filter in Python (if query provided)
-            if search_query:
-                search_lower = search_query.lower()
-                filtered = []
-                for article in articles:
-                    title = (article.get('title') or '').lower()
-                    description = (article.get('description') or '').lower()
-                    content = (article.get('full_content') or '').lower()
-                    if search_lower in title or search_lower in description or search_lower in content:
-                        filtered.append(article)
-                articles = filtered
-            
-            # Apply blacklist filter if provided
-            if blacklist_keywords:
-                filtered_articles = []
-                for article in articles:
-                    # Check title, description, and full_content
-                    title = (article.get('title') or '').lower()
-                    description = (article.get('description') or '').lower()
-                    full_content = (article.get('full_content') or '').lower()
-                    
-                    # Combine all text for checking
-                    all_text = f"{title} {description} {full_content}"
-                    
-                    should_include = True
-                    
-                    # Check each keyword (case-insensitive)
-                    for keyword in blacklist_keywords:
-                        keyword_lower = keyword.lower().strip()
-                        if keyword_lower and keyword_lower in all_text:
-                            should_include = False
-                            break
-                    
-                    if should_include:
-                        filtered_articles.append(article)
+                response = query.execute()
+                rows = response.data if response.data else []
+                
+                cursor = None
+                if len(rows) == limit and rows[-1].get('published_at'):
+                    cursor = (rows[-1]['published_at'], str(rows[-1]['id']))
                 
-                return filtered_articles
+                articles.extend(self._filter_articles(rows, categories=categories, blacklist_keywords=blacklist_keywords))
+                if len(articles) > limit and articles[limit - 1].get('published_at'):
+                    # Continue right after the last article shown
+                    last = articles[limit - 1]
+                    return articles[:limit], (last['published_at'], str(last['id']))
+                if len(articles) >= limit or cursor is None:
+                    break
             
+            return articles, cursor
+        except Exception as e:
+            print(f"Error getting articles page: {e}")
+            return [], None
+    
+    def _filter_articles(
+        self,
+        articles: List[Dict[str, Any]],
+        category: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        blacklist_keywords: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Apply category, search and blacklist filters in Python."""
+        # Filter by category (check both category field and categories array)
+        if category:
+            filtered = []
+            for article in articles:
+                article_category = article.get('category', '')
+                article_categories = article.get('categories', []) or []
+                # Check if category matches either the single category field or is in the array
+                if article_category == category or category in article_categories:
+                    filtered.append(article)
+            articles = filtered
+        
+        # Filter by categories array (if provided)
+        # Logic: Article is INCLUDED ONLY if ALL its categories are in the selected list
+        # If ANY category is NOT in the selected list, filter it out
+        # Special case: If categories is empty/None, don't filter (show all)
+        if categories and len(categories) > 0:
+            # Equivalent: hide the article if any of its valid categories is deselected.
+            # One set test per article instead of nested list scans.
+            selected_lower = {cat.lower().strip() for cat in categories if cat}
+            deselected = {cat.lower().strip() for cat in CATEGORIES} - selected_lower
+            filtered = []
+            for article in articles:
+                article_cats = list(article.get('categories') or [])
+                if article.get('category'):
+                    article_cats.append(article['category'])
+                # Articles without (valid) categories are always included
+                if deselected.isdisjoint(cat.lower().strip() for cat in article_cats if cat):
+                    filtered.append(article)
+            articles = filtered
+        
+        is_blacklisted = blacklist_matcher(blacklist_keywords)
+        if not search_query and not is_blacklisted:
             return articles
+        
+        # Search and blacklist filters share one lowercased text per article
+        # (title, description and full_content)
+        search_lower = search_query.lower() if search_query else None
+        filtered = []
+        for article in articles:
+            all_text = article_search_text(article)
+            if search_lower and search_lower not in all_text:
+                continue
+            if is_blacklisted and is_blacklisted(all_text):
+                continue
+            filtered.append(article)
+        
+        return filtered
+    
+    def get_filtered_out_articles(
+        self,
+        blacklist_keywords: Optional[List[str]] = None,
+        selected_categories: Optional[List[str]] = None,
+        limit: int = 200
+    ) -> List[Dict[str, Any]]:
+        """
+        Get articles that the user's filters would hide, filtered in the database.
+        
+        An article is filtered out if it contains a blacklisted keyword (title,
+        description or full_content) or has a valid category that is not selected.
+        An empty selected_categories list means no category filter.
+        
+        Uses the filtered_out_articles RPC; falls back to a PostgREST OR filter if
+        the function is not installed yet.
+        """
+        blacklist = [kw.strip() for kw in (blacklist_keywords or []) if kw and kw.strip()]
+        excluded_categories = _excluded_categories(selected_categories)
+        if not blacklist and not excluded_categories:
+            return []
+        
+        try:
+            response = self.client.rpc('filtered_out_articles', {
+                'p_blacklist': blacklist,
+                'p_excluded_categories': excluded_categories,
+                'p_limit': limit
+            }).execute()
+            return response.data or []
         except Exception as e:
-            import traceback
-            print(f"Error getting articles: {e}")
-            traceback.print_exc()
+            print(f"filtered_out_articles RPC not available, using OR filter: {e}")
+        
+        try:
+            conditions = []
+            
+            for keyword in blacklist:
+                pattern = _postgrest_quote(_ilike_contains(keyword))
+                conditions.extend(
+                    f"{column}.ilike.{pattern}" for column in ('title', 'description', 'full_content')
+                )
+            
+            if selected_categories:
+                selected_lower = {cat.lower().strip() for cat in selected_categories if cat}
+                deselected = [cat for cat in CATEGORIES if cat.lower().strip() not in selected_lower]
+                if deselected:
+                    quoted = ','.join(_postgrest_quote(cat) for cat in deselected)
+                    conditions.append(f"categories.ov.{{{quoted}}}")
+                    conditions.append(f"category.in.({quoted})")
+            
+            if not conditions:
+                return []
+            
+            response = (
+                self.client.table('articles')
+                .select('*')
+                .or_(','.join(conditions))
+                .order('published_at', desc=True)
+                .limit(limit)
+                .execute()
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error getting filtered articles: {e}")
             return []
     
+    def get_daily_stats(
+        self,
+        blacklist_keywords: Optional[List[str]] = None,
+        selected_categories: Optional[List[str]] = None,
+        days: int = 7
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get included/excluded article counts per day via the stats_last_7_days RPC.
+        
+        Returns:
+            List of dicts with 'day' (YYYY-MM-DD), 'included' and 'excluded', newest first,
+            or None if the RPC is not available (e.g. schema not updated yet)
+        """
+        try:
+            response = self.client.rpc('stats_last_7_days', {
+                'p_blacklist': [kw.strip() for kw in (blacklist_keywords or []) if kw and kw.strip()],
+                'p_excluded_categories': _excluded_categories(selected_categories),
+                'p_days': days
+            }).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error getting daily stats: {e}")
+            return None
+    
     def get_article_by_id(self, article_id: str) -> Optional[Dict[str, Any]]:
         """Get a single article by ID."""
         try:
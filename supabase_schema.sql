@@ -11,6 +11,7 @@ CREATE TABLE IF NOT EXISTS articles (
     source TEXT DEFAULT 'NOS',
     published_at TIMESTAMPTZ,
     full_content TEXT,
+    summary_plain TEXT,  -- First sentences of full_content as plain text (precomputed at ingest)
     image_url TEXT,
     category TEXT,  -- Legacy single category (kept for compatibility)
     categories TEXT[],  -- New: multiple categories array
@@ -21,6 +22,9 @@ CREATE TABLE IF NOT EXISTS articles (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Migrate: Add summary_plain column for existing databases
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS summary_plain TEXT;
+
 -- Create index on stable_id for fast lookups
 CREATE INDEX IF NOT EXISTS idx_articles_stable_id ON articles(stable_id);
 
@@ -89,3 +93,84 @@ CREATE TRIGGER update_articles_updated_at BEFORE UPDATE ON articles
 CREATE TRIGGER update_user_preferences_updated_at BEFORE UPDATE ON user_preferences
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- TRUE if the user's filters hide this article: one of its categories is in
+-- p_excluded_categories (lowercased valid categories the user has NOT selected),
+-- or title/description/full_content contains a blacklist keyword (case-insensitive).
+CREATE OR REPLACE FUNCTION article_is_filtered_out(
+    a articles,
+    p_blacklist TEXT[],
+    p_excluded_categories TEXT[]
+)
+RETURNS BOOLEAN
+LANGUAGE sql STABLE AS $$
+    SELECT
+        EXISTS (
+            SELECT 1 FROM unnest(coalesce(a.categories, '{}') || a.category) AS c
+            WHERE lower(trim(c)) = ANY(p_excluded_categories)
+        )
+        OR EXISTS (
+            SELECT 1 FROM unnest(p_blacklist) AS kw
+            WHERE trim(kw) <> ''
+              AND lower(coalesce(a.title, '') || ' ' || coalesce(a.description, '') || ' ' || coalesce(a.full_content, ''))
+                  LIKE '%' || replace(replace(replace(lower(trim(kw)), '\', '\\'), '%', '\%'), '_', '\_') || '%'
+        );
+$$;
+
+-- Daily included/excluded article counts for the statistics panel.
+-- Evaluates the user's blacklist and category filter in SQL so the app only
+-- receives one row per day instead of all recent articles.
+CREATE OR REPLACE FUNCTION stats_last_7_days(
+    p_blacklist TEXT[] DEFAULT '{}',
+    p_excluded_categories TEXT[] DEFAULT '{}',
+    p_days INT DEFAULT 7
+)
+RETURNS TABLE(day DATE, included INT, excluded INT)
+LANGUAGE sql STABLE AS $$
+    WITH recent AS (
+        SELECT
+            (a.published_at AT TIME ZONE 'Europe/Amsterdam')::date AS day,
+            article_is_filtered_out(a, p_blacklist, p_excluded_categories) AS is_excluded
+        FROM articles a
+        WHERE a.published_at >= now() - make_interval(days => p_days)
+    )
+    SELECT
+        day,
+        (count(*) FILTER (WHERE NOT is_excluded))::int AS included,
+        (count(*) FILTER (WHERE is_excluded))::int AS excluded
+    FROM recent
+    GROUP BY day
+    ORDER BY day DESC;
+$$;
+
+-- Articles hidden by the user's filters, for the "Dit wil je niet" page.
+-- Same filter semantics as stats_last_7_days, newest first.
+CREATE OR REPLACE FUNCTION filtered_out_articles(
+    p_blacklist TEXT[] DEFAULT '{}',
+    p_excluded_categories TEXT[] DEFAULT '{}',
+    p_limit INT DEFAULT 200
+)
+RETURNS SETOF articles
+LANGUAGE sql STABLE AS $$
+    SELECT a.*
+    FROM articles a
+    WHERE article_is_filtered_out(a, p_blacklist, p_excluded_categories)
+    ORDER BY a.published_at DESC
+    LIMIT p_limit;
+$$;
+
+-- Category writes of a recategorize run: one set-based UPDATE per batch.
+-- p_rows: [{"id": "...", "categories": ["..."], "categorization_llm": "..."}, ...]
+-- Only these two columns are touched, so ELI5 summaries written meanwhile are kept.
+CREATE OR REPLACE FUNCTION update_article_categories(p_rows JSONB)
+RETURNS INT
+LANGUAGE sql AS $$
+    WITH updated AS (
+        UPDATE articles a
+        SET categories = ARRAY(SELECT jsonb_array_elements_text(r.categories)),
+            categorization_llm = r.categorization_llm
+        FROM jsonb_to_recordset(p_rows) AS r(id UUID, categories JSONB, categorization_llm TEXT)
+        WHERE a.id = r.id
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM updated;
+$$;